@@ -1,33 +1,66 @@
 import os
 import json
 import threading
-import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from PIL import Image, ImageTk
-import exifread
-import hashlib
-# Configure matplotlib to use Agg backend for headless environments
-import matplotlib
-
-matplotlib.use('Agg')  # Must be before importing pyplot
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
 import io
+import bisect
+import itertools
 import struct
-import re
-import PyPDF2
 import random
 import string
 import datetime
 import base64
 import shutil
+import file_utils
+import file_signatures
+import metadata_extractors
+import metadata_stripper
+import exporters
+import result_sinks
+import string_extractor
+import pattern_scanner
+import pdf_scanner
+from file_view import FileView
+from config import AppConfig
+from constants import EXPORT_FORMATS
+from file_processors import BatchProcessor
+from lazy_imports import lazy_import
+
+
+def _use_agg_backend():
+    # Configure matplotlib to use Agg backend for headless environments;
+    # must happen before pyplot is imported
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+# Heavy libraries are imported the first time a feature needs them, so the
+# window comes up without waiting for them
+Image = lazy_import("PIL.Image")
+ImageTk = lazy_import("PIL.ImageTk")
+exifread = lazy_import("exifread")
+plt = lazy_import("matplotlib.pyplot", before_import=_use_agg_backend)
+backend_tkagg = lazy_import("matplotlib.backends.backend_tkagg", before_import=_use_agg_backend)
+np = lazy_import("numpy")
+PyPDF2 = lazy_import("PyPDF2")
+entropy = lazy_import("entropy")
 
 # Constants
 APP_NAME = "File Scope"
 APP_VERSION = "3.0.0"
 
+# Singular labels the UI uses for file_utils categories
+CATEGORY_LABELS = {
+    "Images": "Image",
+    "Audio": "Audio",
+    "Video": "Video",
+    "Documents": "Document",
+}
+
+# Strings shown per page in the advanced analysis dialog
+STRINGS_PAGE_SIZE = 1000
+
 # Define theme colors
 LIGHT_THEME = {
     "bg_color": "#F0F0F0",
@@ -65,6 +98,10 @@ class FileScope:
         self.file_metadata = {}
         self.theme = "light"
         self.colors = LIGHT_THEME  # Default to light theme
+        self.config = AppConfig()
+        # None when the cache is disabled in the settings
+        self.metadata_cache = self.config.create_metadata_cache()
+        self.batch_processor = None
 
         # Configure window
         self.root.geometry("1000x800")
@@ -118,6 +155,18 @@ class FileScope:
         )
         upload_button.pack(side=tk.LEFT, padx=5)
 
+        batch_button = tk.Button(
+            upload_frame,
+            text="Batch Folder",
+            command=self.batch_folder,
+            font=("Arial", 12),
+            bg=self.colors["button_bg"],
+            fg=self.colors["button_fg"],
+            padx=10,
+            pady=5
+        )
+        batch_button.pack(side=tk.LEFT, padx=5)
+
         self.file_path_var = tk.StringVar(value="No file selected")
         file_path_label = tk.Label(
             upload_frame,
@@ -402,6 +451,64 @@ class FileScope:
         else:
             self.status_var.set("No file selected")
 
+    def batch_folder(self):
+        """Extract metadata for every file below a folder, streaming the results to a file"""
+        if self.batch_processor is not None and self.batch_processor.active:
+            messagebox.showwarning("Batch Running", "A batch is already running")
+            return
+
+        directory = filedialog.askdirectory(title="Select Folder for Batch Processing")
+        if not directory:
+            return
+
+        output_path = filedialog.asksaveasfilename(
+            title="Save Batch Results",
+            defaultextension=".jsonl",
+            filetypes=[
+                (name, f"*{ext}") for name, ext in EXPORT_FORMATS.items()
+                if ext in result_sinks.FILE_SINK_FORMATS and exporters.export_format_available(ext)
+            ]
+        )
+        if not output_path:
+            return
+
+        # results.jsonl.gz is written compressed
+        format_type = os.path.splitext(exporters.strip_compression_extension(output_path))[1].lower()
+        try:
+            sink = result_sinks.open_file_sink(output_path, format_type)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to create {os.path.basename(output_path)}: {str(e)}")
+            return
+
+        self.batch_processor = BatchProcessor(
+            callback=lambda *args, **kwargs: self._batch_progress(output_path, *args, **kwargs),
+            max_workers=os.cpu_count() or 4,
+            cache=self.metadata_cache,
+            verify_hashes=self.config.get("verify_cached_hashes", False),
+            backend=self.config.get("batch_backend", "thread"),
+            sink=sink
+        )
+        # The folder is walked in the background while extraction runs
+        self.batch_processor.add_directory(directory)
+        self.batch_processor.start()
+
+        self.file_path_var.set(directory)
+        self.status_var.set(f"Processing {directory}...")
+        self.progress.start()
+
+    def _batch_progress(self, output_path, progress, processed, total, finished=False):
+        # Called from worker threads; only every 100th update reaches the UI
+        if finished:
+            self.root.after(0, lambda: self._batch_complete(output_path, processed))
+        elif processed % 100 == 0:
+            self.root.after(0, lambda: self.status_var.set(f"Processed {processed} of {total} files..."))
+
+    def _batch_complete(self, output_path, processed):
+        """Handle batch completion (called in main thread)"""
+        self.progress.stop()
+        self.status_var.set(f"Batch results for {processed} files saved to {os.path.basename(output_path)}")
+        messagebox.showinfo("Batch Processing", f"Processed {processed} files\nResults saved as {output_path}")
+
     def set_image(self, file_path):
         """Set an image for preview"""
         # Clear existing preview
@@ -462,23 +569,7 @@ class FileScope:
 
     def get_file_type_category(self, file_path):
         """Determine the category of a file based on its extension"""
-        ext = os.path.splitext(file_path)[1].lower()
-
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp']
-        audio_extensions = ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a']
-        video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv']
-        document_extensions = ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.xls', '.xlsx', '.ppt', '.pptx']
-
-        if ext in image_extensions:
-            return "Image"
-        elif ext in audio_extensions:
-            return "Audio"
-        elif ext in video_extensions:
-            return "Video"
-        elif ext in document_extensions:
-            return "Document"
-        else:
-            return "Other"
+        return CATEGORY_LABELS.get(file_utils.get_file_type_category(file_path), "Other")
 
     def check_metadata(self):
         """Check metadata for the current file"""
@@ -496,7 +587,7 @@ class FileScope:
     def _extract_metadata_thread(self):
         """Extract metadata in a background thread"""
         try:
-            # Extract metadata
+            # Extract metadata, reusing the cached result if the file is unchanged
             self.file_metadata = self.extract_metadata(self.current_file)
 
             # Update UI in the main thread
@@ -511,8 +602,9 @@ class FileScope:
         self.metadata_display.delete(1.0, tk.END)
 
         for key, value in self.file_metadata.items():
-            if key == 'GPS Coordinates' and value and isinstance(value, tuple):
-                lat, lon = value
+            position = metadata_extractors.parse_gps_coordinates(value) if key == 'GPS Coordinates' else None
+            if position:
+                lat, lon = position
                 self.metadata_display.insert(tk.END, f"{key}: https://www.google.com/maps?q={lat},{lon}\n")
             else:
                 self.metadata_display.insert(tk.END, f"{key}: {value}\n")
@@ -529,93 +621,9 @@ class FileScope:
 
     def extract_metadata(self, file_path):
         """Extract metadata based on file type"""
-        metadata = {}
-        file_type = self.get_file_type_category(file_path)
-
-        # Common file metadata
-        metadata['File Name'] = os.path.basename(file_path)
-        metadata['File Path'] = file_path
-        metadata['File Size'] = self.format_file_size(os.path.getsize(file_path))
-        metadata['File Type Category'] = file_type
-        metadata['File Extension'] = os.path.splitext(file_path)[1].lower()
-        metadata['Last Modified'] = time.ctime(os.path.getmtime(file_path))
-        metadata['Created'] = time.ctime(os.path.getctime(file_path))
-        metadata['MD5 Checksum'] = self.calculate_checksum(file_path)
-
-        # Type-specific metadata
-        if file_type == "Image":
-            image_metadata = self.extract_image_metadata(file_path)
-            metadata.update(image_metadata)
-        elif file_type == "Audio":
-            audio_metadata = {"Format": "Audio file"}
-            # TODO: Implement audio metadata extraction
-            metadata.update(audio_metadata)
-        elif file_type == "Video":
-            video_metadata = {"Format": "Video file"}
-            # TODO: Implement video metadata extraction
-            metadata.update(video_metadata)
-        elif file_type == "Document":
-            document_metadata = {"Format": "Document file"}
-            # TODO: Implement document metadata extraction
-            metadata.update(document_metadata)
-
-        return metadata
-
-    def extract_image_metadata(self, file_path):
-        """Extract metadata from image files"""
-        metadata = {}
-
-        # Get basic image info using PIL
-        try:
-            with Image.open(file_path) as img:
-                metadata['Image Format'] = img.format
-                metadata['Image Mode'] = img.mode
-                metadata['Image Size'] = f"{img.width} x {img.height} pixels"
-                metadata['Image Resolution'] = f"{img.info.get('dpi', 'Unknown')}"
-        except Exception as e:
-            metadata['Image Processing Error'] = str(e)
-
-        # Get EXIF data
-        try:
-            with open(file_path, 'rb') as f:
-                tags = exifread.process_file(f)
-
-                if tags:
-                    metadata['Camera Model'] = str(tags.get('Image Model', 'Not available'))
-                    metadata['Camera Make'] = str(tags.get('Image Make', 'Not available'))
-                    metadata['Date Taken'] = str(tags.get('EXIF DateTimeOriginal', 'Not available'))
-                    metadata['Exposure Time'] = str(tags.get('EXIF ExposureTime', 'Not available'))
-                    metadata['F Number'] = str(tags.get('EXIF FNumber', 'Not available'))
-                    metadata['ISO'] = str(tags.get('EXIF ISOSpeedRatings', 'Not available'))
-                    metadata['Focal Length'] = str(tags.get('EXIF FocalLength', 'Not available'))
-
-                    # GPS information
-                    if 'GPS GPSLatitude' in tags and 'GPS GPSLongitude' in tags:
-                        lat = self.convert_to_degrees(tags['GPS GPSLatitude'].values)
-                        lon = self.convert_to_degrees(tags['GPS GPSLongitude'].values)
-
-                        if 'GPS GPSLatitudeRef' in tags:
-                            if str(tags['GPS GPSLatitudeRef'].values) != 'N':
-                                lat = -lat
-
-                        if 'GPS GPSLongitudeRef' in tags:
-                            if str(tags['GPS GPSLongitudeRef'].values) != 'E':
-                                lon = -lon
-
-                        metadata['GPS Coordinates'] = (lat, lon)
-                else:
-                    metadata['EXIF Data'] = 'No EXIF data found'
-        except Exception as e:
-            metadata['EXIF Processing Error'] = str(e)
-
-        return metadata
-
-    def convert_to_degrees(self, value):
-        """Convert GPS coordinates to degrees"""
-        d = float(value[0].num) / float(value[0].den)
-        m = float(value[1].num) / float(value[1].den)
-        s = float(value[2].num) / float(value[2].den)
-        return d + (m / 60.0) + (s / 3600.0)
+        return metadata_extractors.extract_metadata(
+            file_path, cache=self.metadata_cache, verify_hashes=self.config.get("verify_cached_hashes", False)
+        )
 
     def format_file_size(self, size_bytes):
         """Format file size in bytes to human-readable format"""
@@ -628,16 +636,6 @@ class FileScope:
         else:
             return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
 
-    def calculate_checksum(self, file_path):
-        """Calculate MD5 checksum for a file"""
-        hasher = hashlib.md5()
-        with open(file_path, 'rb') as f:
-            buf = f.read(65536)  # Read in 64k chunks
-            while len(buf) > 0:
-                hasher.update(buf)
-                buf = f.read(65536)
-        return hasher.hexdigest()
-
     def remove_metadata(self):
         """Remove metadata from the current file"""
         if not self.current_file:
@@ -664,21 +662,15 @@ class FileScope:
             file_type = self.get_file_type_category(self.current_file)
 
             if file_type == "Image":
-                # Remove metadata from image file
-                with Image.open(self.current_file) as img:
-                    data = list(img.getdata())
-                    new_img = Image.new(img.mode, img.size)
-                    new_img.putdata(data)
+                # Generate new file path
+                base_path, ext = os.path.splitext(self.current_file)
+                new_file_path = f"{base_path}_no_metadata{ext}"
 
-                    # Generate new file path
-                    base_path, ext = os.path.splitext(self.current_file)
-                    new_file_path = f"{base_path}_no_metadata{ext}"
+                # JPEG and PNG metadata is dropped without decoding the pixels
+                metadata_stripper.strip_image(self.current_file, new_file_path)
 
-                    # Save new image without metadata
-                    new_img.save(new_file_path)
-
-                    # Update UI in the main thread
-                    self.root.after(0, lambda: self._metadata_removal_complete(new_file_path))
+                # Update UI in the main thread
+                self.root.after(0, lambda: self._metadata_removal_complete(new_file_path))
             else:
                 # Not supported for other file types yet
                 raise Exception(f"Metadata removal not supported for {file_type} files yet")
@@ -745,14 +737,7 @@ class FileScope:
             if file_path.endswith(".json"):
                 with open(file_path, 'w') as file:
                     # Convert any non-serializable values to strings
-                    serializable_metadata = {}
-                    for key, value in self.file_metadata.items():
-                        if isinstance(value, tuple):
-                            serializable_metadata[key] = str(value)
-                        else:
-                            serializable_metadata[key] = value
-
-                    json.dump(serializable_metadata, file, indent=4)
+                    json.dump(self.file_metadata, file, indent=4, default=str)
             else:
                 with open(file_path, 'w') as file:
                     for key, value in self.file_metadata.items():
@@ -1102,7 +1087,7 @@ class FileScope:
 
         # Create figure and canvas for the chart
         fig, ax = plt.subplots(figsize=(8, 6), facecolor=self.colors["bg_color"])
-        canvas = FigureCanvasTkAgg(fig, master=chart_dialog)
+        canvas = backend_tkagg.FigureCanvasTkAgg(fig, master=chart_dialog)
 
         # Create pie chart
         labels = list(categories.keys())
@@ -1180,7 +1165,7 @@ class FileScope:
 
         # Create figure and canvas for the chart
         fig, ax = plt.subplots(figsize=(8, 6), facecolor=self.colors["bg_color"])
-        canvas = FigureCanvasTkAgg(fig, master=chart_dialog)
+        canvas = backend_tkagg.FigureCanvasTkAgg(fig, master=chart_dialog)
 
         # Create bar chart
         labels = ["This File", f"Average {file_type}"]
@@ -1294,10 +1279,34 @@ class FileScope:
         )
         strings_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
+        strings_nav_frame = tk.Frame(strings_frame, bg=self.colors["bg_color"])
+        strings_nav_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+
+        strings_count_var = tk.StringVar()
+        strings_count_label = tk.Label(
+            strings_nav_frame,
+            textvariable=strings_count_var,
+            font=("Arial", 10),
+            bg=self.colors["bg_color"],
+            fg=self.colors["fg_color"]
+        )
+        strings_count_label.pack(side=tk.LEFT)
+
+        more_strings_button = tk.Button(
+            strings_nav_frame,
+            text="Load More Strings",
+            font=("Arial", 10),
+            bg=self.colors["button_bg"],
+            fg=self.colors["button_fg"]
+        )
+        more_strings_button.pack(side=tk.RIGHT)
+
         # Load and analyze the file
+        view = None
         try:
-            with open(self.current_file, 'rb') as f:
-                file_bytes = f.read()
+            # Map the file instead of reading it; slices below are zero-copy
+            view = FileView(self.current_file)
+            file_bytes = view.buffer
 
             # Update binary preview
             binary_text.delete(1.0, tk.END)
@@ -1331,36 +1340,15 @@ class FileScope:
             if len(file_bytes) > 4096:
                 binary_text.insert(tk.END, "\n[Preview limited to first 4KB. File is larger.]\n")
 
-            # Calculate and display entropy
-            def calculate_entropy(data):
-                if not data:
-                    return 0
-
-                # Count byte occurrences
-                byte_counts = {}
-                for byte in data:
-                    if byte not in byte_counts:
-                        byte_counts[byte] = 0
-                    byte_counts[byte] += 1
-
-                # Calculate entropy
-                entropy = 0
-                for count in byte_counts.values():
-                    probability = count / len(data)
-                    entropy -= probability * np.log2(probability)
-
-                return entropy
-
-            # Calculate entropy for file chunks
+            # Calculate entropy for the whole file and for 1KB chunks in one pass
             chunk_size = 1024  # 1KB chunks
-            chunks = [file_bytes[i:i + chunk_size] for i in range(0, len(file_bytes), chunk_size)]
-            chunk_entropies = [calculate_entropy(chunk) for chunk in chunks]
+            file_entropy, chunk_entropies = entropy.entropy_profile(file_bytes, chunk_size)
 
             # Create entropy visualization
             fig, ax = plt.subplots(figsize=(8, 4), facecolor=self.colors["bg_color"])
-            canvas = FigureCanvasTkAgg(fig, master=entropy_frame_inner)
+            canvas = backend_tkagg.FigureCanvasTkAgg(fig, master=entropy_frame_inner)
 
-            x_values = list(range(len(chunk_entropies)))
+            x_values = np.arange(len(chunk_entropies))
             ax.plot(x_values, chunk_entropies, '-o', color='#4CAF50', markersize=3)
             ax.set_xlabel('Chunk (1KB blocks)', color=self.colors["fg_color"])
             ax.set_ylabel('Entropy (bits)', color=self.colors["fg_color"])
@@ -1369,12 +1357,10 @@ class FileScope:
 
             # Mark suspicious regions (high entropy)
             high_entropy_threshold = 7.5
-            for i, entropy in enumerate(chunk_entropies):
-                if entropy > high_entropy_threshold:
-                    ax.axvspan(i - 0.5, i + 0.5, color='red', alpha=0.3)
+            for i in np.flatnonzero(chunk_entropies > high_entropy_threshold):
+                ax.axvspan(i - 0.5, i + 0.5, color='red', alpha=0.3)
 
             # Add annotations
-            file_entropy = calculate_entropy(file_bytes)
             ax.text(0.02, 0.95, f'Overall entropy: {file_entropy:.2f} bits',
                     transform=ax.transAxes, color=self.colors["fg_color"],
                     bbox=dict(facecolor=self.colors["secondary_bg"], alpha=0.7))
@@ -1408,58 +1394,54 @@ class FileScope:
             canvas.draw()
             canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-            # Extract strings
-            def extract_strings(data, min_length=4):
-                strings = []
-                current_string = ""
-                for byte in data:
-                    # Is it a printable ASCII character?
-                    if 32 <= byte <= 126:
-                        current_string += chr(byte)
-                    else:
-                        # If we have a string of minimum length, add it
-                        if len(current_string) >= min_length:
-                            strings.append(current_string)
-                        current_string = ""
-
-                # Don't forget the last string
-                if len(current_string) >= min_length:
-                    strings.append(current_string)
-
-                return strings
+            # Extract strings lazily and show them one page at a time
+            strings = string_extractor.iter_strings(view.searchable)
+            strings_shown = [0]
+
+            def show_more_strings():
+                page = list(itertools.islice(strings, STRINGS_PAGE_SIZE))
+                lines = [f"{offset:08X}  {encoding:<8}  {text}\n" for offset, encoding, text in page]
+                page_text = "".join(lines)
+                strings_text.insert(tk.END, page_text)
+                highlight_suspicious(page_text, lines, strings_shown[0] + 1)
+                strings_shown[0] += len(page)
+
+                if len(page) < STRINGS_PAGE_SIZE:
+                    more_strings_button.config(state=tk.DISABLED)
+                    strings_count_var.set(f"{strings_shown[0]} strings")
+                else:
+                    strings_count_var.set(f"Showing first {strings_shown[0]} strings")
+
+            more_strings_button.config(command=show_more_strings)
+
+            # Highlight suspicious strings, tagging the widget from the
+            # offsets of a single scan over each page
+            def highlight_suspicious(page_text, lines, first_line):
+                line_starts = list(itertools.accumulate((len(line) for line in lines), initial=0))
+                for start, end, _ in pattern_scanner.STRING_SCANNER.scan(page_text.encode('ascii')):
+                    line = bisect.bisect_right(line_starts, start) - 1
+                    column = start - line_starts[line]
+                    strings_text.tag_add(
+                        "suspicious",
+                        f"{first_line + line}.{column}",
+                        f"{first_line + line}.{column + end - start}"
+                    )
 
-            strings = extract_strings(file_bytes)
+            strings_text.tag_configure("suspicious", background="red", foreground="white")
 
-            # Update the strings display
             strings_text.delete(1.0, tk.END)
-            for string in strings:
-                strings_text.insert(tk.END, f"{string}\n")
-
-            # Look for potentially suspicious strings
-            suspicious_patterns = [
-                r"password", r"passwd", r"pass",
-                r"auth", r"login",
-                r"http[s]?://", r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+",
-                r"BEGIN.*PRIVATE KEY", r"ssh-rsa", r"exec\(", r"eval\(",
-                r"powershell", r"cmd\.exe", r"shell", r"socket", r"connect\(",
-                r"process", r"system\(", r"bin/sh", r"bin/bash"
-            ]
+            show_more_strings()
 
-            # Highlight suspicious strings
-            for pattern in suspicious_patterns:
-                start_index = "1.0"
-                while True:
-                    start_index = strings_text.search(pattern, start_index, tk.END, regexp=True)
-                    if not start_index:
-                        break
+            # The strings pager reads from the mapping until the dialog closes
+            def release_view(event):
+                if event.widget is analysis_dialog:
+                    view.close()
 
-                    end_index = f"{start_index}+{len(pattern)}c"
-                    strings_text.tag_add("suspicious", start_index, end_index)
-                    start_index = end_index
-
-            strings_text.tag_configure("suspicious", background="red", foreground="white")
+            analysis_dialog.bind("<Destroy>", release_view)
 
         except Exception as e:
+            if view is not None:
+                view.close()
             messagebox.showerror("Error", f"Failed to analyze file: {str(e)}", parent=analysis_dialog)
 
         # Button frame
@@ -1840,8 +1822,8 @@ try {
 
         # Analyze the PDF
         try:
-            with open(self.current_file, 'rb') as f:
-                pdf = PyPDF2.PdfReader(f)
+            with FileView(self.current_file) as view:
+                pdf = PyPDF2.PdfReader(view.stream())
 
                 # Summary tab
                 summary_text = scrolledtext.ScrolledText(
@@ -1881,6 +1863,10 @@ try {
                     structure_text.insert(tk.END, "PDF TRAILER:\n")
                     structure_text.insert(tk.END, f"{trailer}\n\n")
 
+                structure_text.insert(tk.END, "OBJECT SCAN:\n")
+                for key, value in pdf_scanner.summarize_structure(view.searchable).items():
+                    structure_text.insert(tk.END, f"- {key}: {value}\n")
+
                 # JavaScript tab
                 js_text = scrolledtext.ScrolledText(
                     js_frame,
@@ -1891,38 +1877,34 @@ try {
                 )
                 js_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-                # Look for JavaScript in the PDF
-                js_found = False
-                potential_js_patterns = [
-                    br'/JavaScript',
-                    br'/JS',
-                    br'eval\(',
-                    br'function\(',
-                    br'document\.write'
-                ]
+                # Walk the mapped PDF object by object, inflating compressed
+                # streams, instead of reading it again
+                js_hits = []
+                hidden_hits = {}
+                for indicator in pdf_scanner.iter_indicators(view.searchable):
+                    if indicator.tag in pattern_scanner.PDF_JAVASCRIPT_PATTERNS:
+                        js_hits.append(indicator)
+                    else:
+                        hidden_hits.setdefault(indicator.tag, []).append(indicator)
 
                 js_text.insert(tk.END, "SEARCHING FOR JAVASCRIPT...\n\n")
 
-                # Read the PDF as bytes to search for patterns
-                with open(self.current_file, 'rb') as raw_pdf:
-                    pdf_content = raw_pdf.read()
-
-                    for pattern in potential_js_patterns:
-                        matches = re.finditer(pattern, pdf_content)
-                        for match in matches:
-                            js_found = True
-                            start_pos = max(0, match.start() - 20)
-                            end_pos = min(len(pdf_content), match.end() + 100)
-                            context = pdf_content[start_pos:end_pos]
-
-                            try:
-                                # Try to decode as UTF-8, if not possible, show as hex
-                                decoded = context.decode('utf-8', errors='replace')
-                                js_text.insert(tk.END, f"Found at position {match.start()}: \n{decoded}\n\n")
-                            except:
-                                js_text.insert(tk.END, f"Found at position {match.start()} (binary data)\n\n")
-
-                if not js_found:
+                for indicator in js_hits:
+                    if indicator.number is None:
+                        location = f"position {indicator.offset}"
+                    elif indicator.location == "stream":
+                        location = f"object {indicator.number} (decoded stream at position {indicator.offset})"
+                    else:
+                        location = f"object {indicator.number} (position {indicator.offset})"
+
+                    try:
+                        # Try to decode as UTF-8, if not possible, show as hex
+                        decoded = indicator.context.decode('utf-8', errors='replace')
+                        js_text.insert(tk.END, f"Found in {location}: \n{decoded}\n\n")
+                    except:
+                        js_text.insert(tk.END, f"Found in {location} (binary data)\n\n")
+
+                if not js_hits:
                     js_text.insert(tk.END, "No JavaScript found in this PDF.\n")
 
                 # Hidden content tab
@@ -1938,36 +1920,25 @@ try {
                 # Look for potential hidden content
                 hidden_text.insert(tk.END, "SEARCHING FOR HIDDEN CONTENT...\n\n")
 
-                suspicious_patterns = {
-                    "Embedded Files": br'/EmbeddedFiles',
-                    "File Attachment": br'/FileAttachment',
-                    "Launch Action": br'/Launch',
-                    "URI Action": br'/URI',
-                    "Hidden Layers": br'/OCG',
-                    "AcroForm": br'/AcroForm',
-                    "XFA Forms": br'/XFA'
-                }
-
-                found_suspicious = False
-
-                for name, pattern in suspicious_patterns.items():
-                    if pattern in pdf_content:
-                        found_suspicious = True
-                        hidden_text.insert(tk.END, f"Found {name} - This PDF contains potentially hidden content\n")
-
-                        # For URI actions, try to extract the URLs
-                        if name == "URI Action":
-                            urls = re.findall(br'/URI\s*\(([^)]+)\)', pdf_content)
-                            if urls:
-                                hidden_text.insert(tk.END, "  URLs found:\n")
-                                for url in urls:
-                                    try:
-                                        decoded_url = url.decode('utf-8', errors='replace')
-                                        hidden_text.insert(tk.END, f"    - {decoded_url}\n")
-                                    except:
-                                        hidden_text.insert(tk.END, f"    - [Unable to decode URL]\n")
-
-                if not found_suspicious:
+                for name in pattern_scanner.PDF_HIDDEN_CONTENT_PATTERNS:
+                    if name not in hidden_hits:
+                        continue
+
+                    hidden_text.insert(tk.END, f"Found {name} - This PDF contains potentially hidden content\n")
+
+                    # For URI actions, try to extract the URLs
+                    if name == "URI Action":
+                        urls = [indicator.value for indicator in hidden_hits[name] if indicator.value]
+                        if urls:
+                            hidden_text.insert(tk.END, "  URLs found:\n")
+                            for url in urls:
+                                try:
+                                    decoded_url = url.decode('utf-8', errors='replace')
+                                    hidden_text.insert(tk.END, f"    - {decoded_url}\n")
+                                except:
+                                    hidden_text.insert(tk.END, f"    - [Unable to decode URL]\n")
+
+                if not hidden_hits:
                     hidden_text.insert(tk.END, "No suspicious hidden content detected.\n")
 
         except Exception as e:
@@ -2283,8 +2254,12 @@ try {
         info_frame = tk.Frame(spoof_dialog, bg=self.colors["bg_color"])
         info_frame.pack(fill=tk.X, padx=10, pady=5)
 
+        sniff = file_signatures.sniff_file(self.current_file)
         info_text = f"Current File: {os.path.basename(self.current_file)}\n"
-        info_text += f"Size: {self.format_file_size(os.path.getsize(self.current_file))}"
+        info_text += f"Size: {self.format_file_size(os.path.getsize(self.current_file))}\n"
+        info_text += f"Detected Type: {sniff['Detected Type']}"
+        if sniff['Signature Mismatch']:
+            info_text += f" (does not match {sniff['Claimed Type']} extension)"
 
         info_label = tk.Label(
             info_frame,
@@ -2448,18 +2423,22 @@ try {
                         )
 
                         if save_path:
-                            # Read the original file
-                            with open(self.current_file, 'rb') as f:
-                                file_data = f.read()
+                            # The source stays mapped while writing, so never
+                            # truncate it in place
+                            overwrite = os.path.exists(save_path) and os.path.samefile(save_path, self.current_file)
+                            target_path = save_path + ".tmp" if overwrite else save_path
 
                             # Create a new file with modified signature
-                            with open(save_path, 'wb') as f:
+                            with FileView(self.current_file) as view, open(target_path, 'wb') as f:
                                 # Write the new signature bytes
                                 f.write(sig_bytes)
 
                                 # Write the rest of the file, skipping the first len(sig_bytes)
-                                if len(file_data) > len(sig_bytes):
-                                    f.write(file_data[len(sig_bytes):])
+                                if len(view) > len(sig_bytes):
+                                    f.write(view[len(sig_bytes):])
+
+                            if overwrite:
+                                os.replace(target_path, save_path)
 
                             messagebox.showinfo(
                                 "Success",
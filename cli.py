@@ -0,0 +1,531 @@
+"""
+Headless command line interface for batch metadata extraction.
+
+    python cli.py [options] PATH [PATH ...]
+    python cli.py sanitize -d OUTPUT_DIR [options] PATH [PATH ...]
+    python cli.py strings [options] PATH [PATH ...]
+    python cli.py scan [options] PATH [PATH ...]
+    python cli.py pdf-triage [options] PATH [PATH ...]
+
+Only the extraction and export layers are imported here, never tkinter,
+matplotlib or PIL.ImageTk, so it runs on servers without a display.
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import threading
+
+import file_utils
+import exporters
+from exporters import CSV_LAYOUTS, HTML_PAGE_SIZE, JSONL_COMPRESSIONS
+from file_processors import BatchProcessor, BATCH_BACKENDS
+from extractor_registry import EXTRACTION_TIERS, TIER_FULL
+from file_walker import SYMLINK_POLICIES
+from result_sinks import CallbackSink, JsonlSink, CsvSink, open_file_sink
+
+
+OUTPUT_FORMATS = ('json', 'jsonl', 'csv', 'xml', 'html', 'txt', 'parquet', 'arrow')
+
+# Formats written as results arrive instead of after the whole batch
+STREAMING_FORMATS = ('jsonl', 'csv', 'xml', 'html', 'parquet', 'arrow')
+
+# "FIELD OPERATOR VALUE", with the operators FileFilter understands
+CRITERION_PATTERN = re.compile(
+    r"^\s*(?P<field>.+?)\s*(?P<operator>==|!=|>=|<=|>|<)\s*(?P<value>.*?)\s*$"
+    r"|^\s*(?P<word_field>.+?)\s+(?P<word_operator>contains|starts_with|ends_with)\s+(?P<word_value>.*?)\s*$"
+)
+
+
+def _checksum_list(value):
+    algorithms = [algorithm.strip().lower() for algorithm in value.split(",") if algorithm.strip()]
+    for algorithm in algorithms:
+        if algorithm not in file_utils.HASH_ALGORITHMS:
+            raise argparse.ArgumentTypeError(
+                f"unsupported checksum '{algorithm}' (choose from {', '.join(file_utils.HASH_ALGORITHMS)})"
+            )
+    return algorithms
+
+
+def _criterion(value):
+    match = CRITERION_PATTERN.match(value)
+    if not match:
+        raise argparse.ArgumentTypeError(
+            f"invalid criterion '{value}' (expected e.g. 'File Size > 1000000' or 'MIME Type contains pdf')"
+        )
+    if match.group('field') is not None:
+        return {'field': match.group('field'), 'operator': match.group('operator'), 'value': match.group('value')}
+    return {
+        'field': match.group('word_field'),
+        'operator': match.group('word_operator'),
+        'value': match.group('word_value'),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="filescope",
+        description="Extract file metadata in batch without the graphical interface.",
+        epilog="Other commands: 'filescope sanitize' removes metadata from files in batch, "
+               "'filescope strings' lists the printable strings of files, 'filescope scan' "
+               "counts suspicious indicators in them and 'filescope pdf-triage' summarizes PDFs; "
+               "add --help to any of them for its options."
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="files or directories to process")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file (default: JSON lines on standard output)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS,
+                        help="output format (default: taken from the output file extension, else jsonl)")
+    parser.add_argument("--compress", choices=JSONL_COMPRESSIONS,
+                        help="compress jsonl output as it is written "
+                             "(default: from the output file extension, e.g. .jsonl.gz, .jsonl.xz, .jsonl.zst)")
+    parser.add_argument("--rotate-size", type=int, metavar="BYTES",
+                        help="start a new jsonl file once the current one reaches about BYTES")
+    parser.add_argument("--csv-layout", choices=CSV_LAYOUTS, default="wide",
+                        help="wide: one row per file and a column per field, "
+                             "long: one (file, field, value) row per field (default: wide)")
+    parser.add_argument("--page-size", type=int, default=HTML_PAGE_SIZE, metavar="FILES",
+                        help=f"files per page of an html report (default: {HTML_PAGE_SIZE})")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 4,
+                        help="number of parallel workers (default: CPU count)")
+    parser.add_argument("--backend", choices=BATCH_BACKENDS, default="thread",
+                        help="where extraction runs (default: thread)")
+
+    parser.add_argument("-t", "--tier", type=int, choices=EXTRACTION_TIERS, default=TIER_FULL,
+                        help="0: stat fields only, 1: adds content sniffing and header metadata, "
+                             "2: adds checksums and full parsing (default: 2)")
+    parser.add_argument("--escalate", type=_criterion, action="append", metavar="CRITERION",
+                        help="re-extract files matching CRITERION at tier 2, e.g. 'File Size > 1000000' "
+                             "(repeatable, all must match)")
+
+    checksums = parser.add_mutually_exclusive_group()
+    checksums.add_argument("--checksums", type=_checksum_list, default=list(file_utils.HASH_ALGORITHMS),
+                           metavar="ALGORITHMS",
+                           help="comma-separated checksums to calculate at tier 2 (default: md5,sha1,sha256)")
+    checksums.add_argument("--no-checksums", dest="checksums", action="store_const", const=[],
+                           help="skip checksum calculation")
+
+    _add_walk_arguments(parser)
+
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse results from the persistent metadata cache")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+    return parser
+
+
+def build_sanitize_parser():
+    parser = argparse.ArgumentParser(
+        prog="filescope sanitize",
+        description="Write copies of images and audio files without their metadata to a mirror tree."
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="files or directories to sanitize")
+    parser.add_argument("-d", "--output-dir", required=True,
+                        help="directory the sanitized tree is written to")
+    parser.add_argument("-m", "--manifest", default="-",
+                        help="manifest file, .jsonl (optionally .gz, .xz or .zst) or .csv "
+                             "(default: JSON lines on standard output)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 4,
+                        help="number of parallel workers (default: CPU count)")
+    parser.add_argument("--no-verify", dest="verify", action="store_false",
+                        help="do not re-extract the outputs to check that no metadata remains")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="sanitize again even when the output is newer than the source")
+    _add_walk_arguments(parser)
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+    return parser
+
+
+def build_strings_parser():
+    from string_extractor import DEFAULT_MIN_LENGTH, ENCODINGS
+
+    parser = argparse.ArgumentParser(
+        prog="filescope strings",
+        description="List the printable strings of files as JSON lines with their offset and encoding."
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="files or directories to read")
+    _add_report_output_argument(parser)
+    parser.add_argument("-n", "--min-length", type=int, default=DEFAULT_MIN_LENGTH, metavar="CHARS",
+                        help=f"shortest string to report (default: {DEFAULT_MIN_LENGTH})")
+    parser.add_argument("-e", "--encoding", dest="encodings", action="append", choices=ENCODINGS,
+                        help=f"string encoding to look for (repeatable, default: {', '.join(ENCODINGS)})")
+    _add_walk_arguments(parser)
+    return parser
+
+
+def build_scan_parser():
+    parser = argparse.ArgumentParser(
+        prog="filescope scan",
+        description="Count suspicious indicators (credentials, URLs, keys, shell commands, ...) in files "
+                    "and report every file with a hit as a JSON line."
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="files or directories to scan")
+    _add_report_output_argument(parser)
+    parser.add_argument("--pdf", action="store_true",
+                        help="look for PDF JavaScript and hidden content indicators instead")
+    _add_walk_arguments(parser)
+    return parser
+
+
+def build_pdf_triage_parser():
+    parser = argparse.ArgumentParser(
+        prog="filescope pdf-triage",
+        description="Summarize the object structure and JavaScript, action and attachment indicators "
+                    "of PDF files as JSON lines."
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="PDF files or directories to triage")
+    _add_report_output_argument(parser)
+    parser.add_argument("--no-inflate", dest="inflate", action="store_false",
+                        help="do not decompress Flate streams before looking for indicators")
+    _add_walk_arguments(parser)
+    return parser
+
+
+def _add_report_output_argument(parser):
+    parser.add_argument("-o", "--output", default="-",
+                        help="output .jsonl file, optionally .gz, .xz or .zst "
+                             "(default: JSON lines on standard output)")
+
+
+def _add_walk_arguments(parser):
+    walking = parser.add_argument_group("directory options")
+    walking.add_argument("-r", "--recursive", action="store_true",
+                         help="descend into subdirectories")
+    walking.add_argument("--max-depth", type=int,
+                         help="maximum subdirectory depth to descend (implies --recursive)")
+    walking.add_argument("--include", action="append", metavar="GLOB",
+                         help="only process files matching GLOB (repeatable)")
+    walking.add_argument("--exclude", action="append", metavar="GLOB",
+                         help="skip files and directories matching GLOB (repeatable)")
+    walking.add_argument("--symlinks", choices=SYMLINK_POLICIES, default="skip",
+                         help="how to treat symbolic links (default: skip)")
+    walking.add_argument("--min-size", type=int, metavar="BYTES", help="skip smaller files")
+    walking.add_argument("--max-size", type=int, metavar="BYTES", help="skip larger files")
+
+
+def _output_format(args):
+    if args.format:
+        return args.format
+    # results.jsonl.gz is jsonl; run() rejects compressed names for any other format
+    ext = os.path.splitext(exporters.strip_compression_extension(args.output))[1].lower().lstrip(".")
+    return ext if ext in OUTPUT_FORMATS else "jsonl"
+
+
+def _compressor_available(compression):
+    if compression == 'zstd' and not exporters.HAS_ZSTANDARD:
+        print("filescope: zstd compression needs the zstandard package (pip install zstandard)", file=sys.stderr)
+        return False
+    return True
+
+
+def _print_json_line(record):
+    # Same encoding as JSON lines written to a file
+    sys.stdout.buffer.write(exporters.json_line(record))
+
+
+def _walk_options(args):
+    if args.max_depth is not None:
+        max_depth = args.max_depth
+    else:
+        max_depth = None if args.recursive else 0
+
+    return {
+        'include': args.include,
+        'exclude': args.exclude,
+        'symlinks': args.symlinks,
+        'max_depth': max_depth,
+        'min_size': args.min_size,
+        'max_size': args.max_size,
+    }
+
+
+def _existing_paths(paths):
+    existing = []
+    for path in paths:
+        if os.path.exists(path):
+            existing.append(path)
+        else:
+            print(f"filescope: no such file or directory: {path}", file=sys.stderr)
+    return existing
+
+
+def _record(path, metadata):
+    if 'File Path' in metadata:
+        return metadata
+    return {'File Path': path, **metadata}
+
+
+def _silence_stdout():
+    # Python flushes stdout again at exit, which would raise once more
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+
+def run(args):
+    output_format = _output_format(args)
+    to_stdout = args.output == "-"
+    if to_stdout and output_format not in ('json', 'jsonl'):
+        print(f"filescope: {output_format} output needs --output", file=sys.stderr)
+        return 2
+    if "." + output_format in exporters.COLUMNAR_FORMATS and not exporters.HAS_PYARROW:
+        print(f"filescope: {output_format} output needs the pyarrow package (pip install pyarrow)", file=sys.stderr)
+        return 2
+    compression = args.compress or ('none' if to_stdout else exporters.compression_from_path(args.output))
+    if compression != 'none' or args.rotate_size:
+        if output_format != 'jsonl':
+            print(f"filescope: compression and --rotate-size only apply to jsonl output, not {output_format}",
+                  file=sys.stderr)
+            return 2
+        if to_stdout:
+            print("filescope: --compress and --rotate-size need --output", file=sys.stderr)
+            return 2
+    if not _compressor_available(compression):
+        return 2
+
+    files = []
+    directories = []
+    for path in args.paths:
+        if os.path.isfile(path):
+            files.append(path)
+        elif os.path.isdir(path):
+            directories.append(path)
+        else:
+            print(f"filescope: no such file or directory: {path}", file=sys.stderr)
+
+    if not files and not directories:
+        return 1
+
+    done = threading.Event()
+    reader_gone = threading.Event()
+
+    def progress(percent, processed, total, finished=False):
+        if finished:
+            if not args.quiet:
+                # The last file was already reported; just end the progress line
+                print(file=sys.stderr)
+            done.set()
+        elif not args.quiet:
+            print(f"\rProcessed {processed}/{total} files", end="", file=sys.stderr, flush=True)
+
+    def print_record(path, metadata):
+        if reader_gone.is_set():
+            return
+        try:
+            _print_json_line(_record(path, metadata))
+        except BrokenPipeError:
+            # e.g. piped into head; stop the batch instead of failing every write
+            _silence_stdout()
+            reader_gone.set()
+            done.set()
+
+    sink = None
+    if output_format in STREAMING_FORMATS:
+        if to_stdout:
+            sink = CallbackSink(print_record)
+        else:
+            sink = open_file_sink(
+                args.output, "." + output_format, args.csv_layout, args.page_size, args.compress, args.rotate_size
+            )
+
+    cache = None
+    if args.cache:
+        from metadata_cache import MetadataCache
+        cache = MetadataCache()
+
+    processor = BatchProcessor(
+        callback=progress,
+        max_workers=max(1, args.workers),
+        calc_checksums=args.checksums,
+        cache=cache,
+        backend=args.backend,
+        sink=sink,
+        tier=args.tier,
+        escalate=args.escalate
+    )
+
+    processor.add_files(files)
+    walk_options = _walk_options(args)
+    for directory in directories:
+        processor.add_directory(directory, **walk_options)
+
+    processor.start()
+    try:
+        while not done.wait(0.5):
+            pass
+        if reader_gone.is_set():
+            processor.stop()
+            return 0
+    except KeyboardInterrupt:
+        processor.stop()
+        if not args.quiet:
+            print("\nInterrupted", file=sys.stderr)
+        return 130
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if sink is not None:
+        return 0
+
+    records = [_record(path, metadata) for path, metadata in sorted(processor.get_results().items())]
+
+    if to_stdout:
+        json.dump(records, sys.stdout, indent=4, default=str)
+        sys.stdout.write("\n")
+        return 0
+
+    if not file_utils.export_metadata_to_file(records, args.output, "." + output_format):
+        return 1
+    return 0
+
+
+def run_report(args, records):
+    """Write the (path, record) pairs of a report subcommand as JSON lines; returns the exit status."""
+    if args.output == "-":
+        sink = CallbackSink(lambda path, record: _print_json_line(_record(path, record)))
+    elif not _compressor_available(exporters.compression_from_path(args.output)):
+        return 2
+    else:
+        sink = JsonlSink(args.output)
+
+    try:
+        for path, record in records:
+            sink.write(path, record)
+    except KeyboardInterrupt:
+        print("\nInterrupted", file=sys.stderr)
+        return 130
+    finally:
+        sink.close()
+    return 0
+
+
+def run_strings(args):
+    from string_extractor import iter_directory_strings, ENCODINGS
+
+    paths = _existing_paths(args.paths)
+    if not paths:
+        return 1
+    if args.min_length < 1:
+        print("filescope: --min-length must be at least 1", file=sys.stderr)
+        return 2
+
+    strings = iter_directory_strings(paths, args.min_length, args.encodings or ENCODINGS, **_walk_options(args))
+    return run_report(args, (
+        (path, {'Offset': offset, 'Encoding': encoding, 'String': text})
+        for path, offset, encoding, text in strings
+    ))
+
+
+def run_scan(args):
+    import pattern_scanner
+
+    paths = _existing_paths(args.paths)
+    if not paths:
+        return 1
+
+    scanner = pattern_scanner.PDF_SCANNER if args.pdf else pattern_scanner.STRING_SCANNER
+    hits = pattern_scanner.scan_directory(paths, scanner, **_walk_options(args))
+    return run_report(args, ((path, {'Indicators': counts}) for path, counts in hits))
+
+
+def run_pdf_triage(args):
+    import pdf_scanner
+
+    paths = _existing_paths(args.paths)
+    if not paths:
+        return 1
+
+    return run_report(args, pdf_scanner.triage_directory(paths, args.inflate, **_walk_options(args)))
+
+
+def run_sanitize(args):
+    from sanitizer import BatchSanitizer, MANIFEST_FIELDS, STATUS_FAILED
+
+    paths = _existing_paths(args.paths)
+    if not paths:
+        return 1
+
+    reader_gone = threading.Event()
+
+    def print_record(path, record):
+        if reader_gone.is_set():
+            return
+        try:
+            _print_json_line(record)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # e.g. piped into head; stop the batch instead of failing every write
+            _silence_stdout()
+            reader_gone.set()
+            sanitizer.stop()
+
+    if args.manifest == "-":
+        sink = CallbackSink(print_record)
+    else:
+        compression = exporters.compression_from_path(args.manifest)
+        if exporters.strip_compression_extension(args.manifest).lower().endswith(".csv"):
+            if compression != 'none':
+                print("filescope: compressed manifests must be .jsonl", file=sys.stderr)
+                return 2
+            sink = CsvSink(args.manifest, MANIFEST_FIELDS)
+        elif not _compressor_available(compression):
+            return 2
+        else:
+            sink = JsonlSink(args.manifest)
+
+    def progress(processed, counts):
+        if not args.quiet:
+            summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+            print(f"\rProcessed {processed} files ({summary})", end="", file=sys.stderr, flush=True)
+
+    sanitizer = BatchSanitizer(
+        args.output_dir,
+        max_workers=max(1, args.workers),
+        verify=args.verify,
+        overwrite=args.overwrite,
+        sink=sink,
+        callback=progress
+    )
+
+    try:
+        counts = sanitizer.run(paths, **_walk_options(args))
+    except ValueError as e:
+        print(f"filescope: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        sanitizer.stop()
+        if not args.quiet:
+            print("\nInterrupted", file=sys.stderr)
+        return 130
+    finally:
+        sink.close()
+
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    return 1 if counts[STATUS_FAILED] else 0
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    try:
+        if argv[:1] == ["sanitize"]:
+            return run_sanitize(build_sanitize_parser().parse_args(argv[1:]))
+        if argv[:1] == ["strings"]:
+            return run_strings(build_strings_parser().parse_args(argv[1:]))
+        if argv[:1] == ["scan"]:
+            return run_scan(build_scan_parser().parse_args(argv[1:]))
+        if argv[:1] == ["pdf-triage"]:
+            return run_pdf_triage(build_pdf_triage_parser().parse_args(argv[1:]))
+
+        args = build_parser().parse_args(argv)
+        return run(args)
+    except BrokenPipeError:
+        _silence_stdout()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
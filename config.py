@@ -1,6 +1,5 @@
 import os
 import json
-import tkinter as tk
 from constants import LIGHT_THEME, DARK_THEME
 
 
@@ -9,11 +8,13 @@ class AppConfig:
     def __init__(self):
         self.config_dir = os.path.join(os.path.expanduser("~"), ".metadata_finder")
         self.config_file = os.path.join(self.config_dir, "config.json")
+        self.cache_file = os.path.join(self.config_dir, "metadata_cache.db")
         self.default_config = {
             "theme": "light",
             "last_directory": os.path.expanduser("~"),
             "export_format": "json",
             "default_batch_limit": 50,
+            "batch_backend": "thread",
             "show_preview": True,
             "max_recent_files": 10,
             "recent_files": [],
@@ -21,6 +22,9 @@ class AppConfig:
             "window_size": "1000x800",
             "advanced_mode": False,
             "auto_check": True,
+            "metadata_cache": True,
+            "metadata_cache_size_mb": 256,
+            "verify_cached_hashes": False,
         }
         self.config = self.default_config.copy()
         self.load_config()
@@ -73,6 +77,14 @@ class AppConfig:
         self.config["recent_files"] = []
         self.save_config()
 
+    def create_metadata_cache(self):
+        if not self.config.get("metadata_cache", True):
+            return None
+
+        from metadata_cache import MetadataCache
+        max_size = self.config.get("metadata_cache_size_mb", 256) * 1024 * 1024
+        return MetadataCache(self.cache_file, max_size)
+
     def get_theme_colors(self):
         if self.config.get("theme") == "dark":
             return DARK_THEME
@@ -3,7 +3,7 @@
 
 FILE_TYPES = {
     'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'],
-    'Documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt'],
+    'Documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.xls', '.xlsx', '.ppt', '.pptx'],
     'Audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a'],
     'Video': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv'],
     'Archives': ['.zip', '.rar', '.7z', '.tar', '.gz'],
@@ -58,9 +58,12 @@ COMMON_METADATA_FIELDS = [
 EXPORT_FORMATS = {
     'Text File': '.txt',
     'JSON File': '.json',
+    'JSON Lines File': '.jsonl',
     'CSV File': '.csv',
     'HTML Report': '.html',
     'XML File': '.xml',
+    'Parquet File': '.parquet',
+    'Arrow IPC File': '.arrow',
 }
 
 
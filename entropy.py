@@ -0,0 +1,100 @@
+import mmap
+import numpy as np
+
+
+DEFAULT_BLOCK_SIZE = 1024
+
+# Bytes histogrammed per vectorized step; bounds the temporary index arrays
+_SEGMENT_SIZE = 4 * 1024 * 1024
+
+
+def _histograms(data, block_size):
+    # One 256-bin histogram per block, computed with a single bincount by
+    # shifting every block's byte values into its own range of bins
+    count = len(data) // block_size
+    blocks = data[:count * block_size].reshape(count, block_size)
+    offsets = np.arange(count, dtype=np.intp)[:, None] * 256
+    bins = (blocks + offsets).ravel()
+    return np.bincount(bins, minlength=count * 256).reshape(count, 256)
+
+
+def _entropy(counts, total):
+    probabilities = counts / total
+    logs = np.log2(probabilities, out=np.zeros_like(probabilities), where=probabilities > 0)
+    return -(probabilities * logs).sum(axis=-1)
+
+
+def calculate_entropy(data):
+    """Shannon entropy in bits per byte of a bytes-like object."""
+    data = np.frombuffer(data, dtype=np.uint8)
+    if not len(data):
+        return 0.0
+    return float(_entropy(np.bincount(data, minlength=256), len(data)))
+
+
+def entropy_profile(data, block_size=DEFAULT_BLOCK_SIZE, step=None):
+    """
+    Compute the whole-buffer entropy and an entropy curve in one pass.
+
+    The curve has one value per window of block_size bytes, with windows
+    starting every step bytes (non-overlapping blocks by default, in which
+    case a trailing partial block gets its own value). block_size must be a
+    multiple of step. data can be any buffer, including an mmap.
+
+    Returns (overall entropy, numpy array of window entropies).
+    """
+    if step is None:
+        step = block_size
+    if step <= 0 or block_size % step:
+        raise ValueError("block_size must be a positive multiple of step")
+
+    data = np.frombuffer(data, dtype=np.uint8)
+    blocks_per_window = block_size // step
+    full_blocks = len(data) // step
+    segment_blocks = max(1, _SEGMENT_SIZE // step)
+
+    overall = np.zeros(256, dtype=np.int64)
+    curve = []
+    carry = np.zeros((0, 256), dtype=np.int64)
+
+    for start in range(0, full_blocks, segment_blocks):
+        stop = min(start + segment_blocks, full_blocks)
+        counts = _histograms(data[start * step:stop * step], step)
+        overall += counts.sum(axis=0)
+
+        if blocks_per_window == 1:
+            curve.append(_entropy(counts, step))
+            continue
+
+        # Sliding windows are sums of consecutive step-sized histograms;
+        # the last few histograms are carried over into the next segment
+        rows = np.concatenate((carry, counts))
+        if len(rows) >= blocks_per_window:
+            cumulative = np.concatenate((np.zeros((1, 256), dtype=np.int64), np.cumsum(rows, axis=0)))
+            windows = cumulative[blocks_per_window:] - cumulative[:-blocks_per_window]
+            curve.append(_entropy(windows, block_size))
+        carry = rows[len(rows) - blocks_per_window + 1:]
+
+    tail = data[full_blocks * step:]
+    if len(tail):
+        tail_counts = np.bincount(tail, minlength=256)
+        overall += tail_counts
+        if blocks_per_window == 1:
+            curve.append(_entropy(tail_counts[None, :], len(tail)))
+
+    overall_entropy = float(_entropy(overall, len(data))) if len(data) else 0.0
+    curve = np.concatenate(curve) if curve else np.zeros(0)
+    return overall_entropy, curve
+
+
+def file_entropy_profile(file_path, block_size=DEFAULT_BLOCK_SIZE, step=None):
+    """entropy_profile() over a memory-mapped file."""
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return entropy_profile(b"", block_size, step)
+
+        with mapped:
+            return entropy_profile(mapped, block_size, step)
@@ -0,0 +1,712 @@
+import os
+import re
+import csv
+import html
+import json
+import datetime
+import tempfile
+from urllib.parse import quote
+from lazy_imports import lazy_import, is_available
+
+# Only needed for Parquet and Arrow export
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+pq = lazy_import("pyarrow.parquet")
+
+HAS_PYARROW = is_available("pyarrow")
+
+# Optional speedups for JSON lines export
+orjson = lazy_import("orjson")
+zstandard = lazy_import("zstandard")
+
+HAS_ORJSON = is_available("orjson")
+HAS_ZSTANDARD = is_available("zstandard")
+
+
+# Characters XML 1.0 does not allow anywhere in a document
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+_INVALID_NAME_CHARS = re.compile(r"[^\w.\-]+")
+
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+
+# Write buffer for exporters; records are formatted in memory one at a time
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# "wide" has one row per file and a column per field, "long" one row per field
+CSV_LAYOUTS = ("wide", "long")
+LONG_CSV_FIELDS = ['File Path', 'Field', 'Value']
+
+# Columnar exports: fields with a column of their own, by type. Every other
+# field goes into the "Fields" map column as a string.
+COLUMNAR_FORMATS = ('.parquet', '.arrow')
+COLUMNAR_STRING_FIELDS = (
+    'File Path', 'File Name', 'File Extension', 'File Type Category', 'MIME Type', 'Detected Type',
+    'Checksum (MD5)', 'Checksum (SHA1)', 'Checksum (SHA256)',
+)
+COLUMNAR_INT_FIELDS = ('File Size', 'Extraction Tier', 'Image Width', 'Image Height')
+COLUMNAR_FLOAT_FIELDS = ('Megapixels',)
+COLUMNAR_TIMESTAMP_FIELDS = {
+    'Creation Date': '%Y-%m-%d %H:%M:%S',
+    'Modified Date': '%Y-%m-%d %H:%M:%S',
+    'Accessed Date': '%Y-%m-%d %H:%M:%S',
+    'Date and Time': '%Y:%m:%d %H:%M:%S',
+}
+# 'GPS Coordinates' ("lat, lon") is split into these two float columns
+COLUMNAR_GPS_FIELDS = ('GPS Latitude', 'GPS Longitude')
+COLUMNAR_MAP_FIELD = 'Fields'
+
+# Rows buffered before they are written as one Parquet row group / Arrow record batch
+COLUMNAR_ROW_GROUP_SIZE = 10000
+
+# JSON lines compression, chosen explicitly or from the output file extension
+JSONL_COMPRESSIONS = ('none', 'gzip', 'xz', 'zstd')
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.xz': 'xz', '.zst': 'zstd'}
+
+# Files per page of an HTML report
+HTML_PAGE_SIZE = 500
+
+# Fields whose values the HTML report search matches against
+HTML_SEARCH_FIELDS = ('File Name', 'File Path', 'MIME Type', 'Detected Type', 'Camera Make', 'Camera Model')
+
+HTML_STYLE = """body { font-family: Arial, sans-serif; margin: 20px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+th { background-color: #f2f2f2; }
+tr:nth-child(even) { background-color: #f9f9f9; }
+h1 { color: #333; }
+nav { margin: 10px 0; }
+nav a { margin-right: 15px; }
+#search { width: 300px; padding: 5px; }
+"""
+
+# Search for the report index page. Chunks are plain scripts rather than
+# fetched JSON so the report also works when opened from disk, and they
+# are only loaded once the user starts typing.
+HTML_SEARCH_SCRIPT = """var entries = [];
+var loaded = 0;
+var loading = false;
+function fileScopeSearch(chunk) { entries = entries.concat(chunk); }
+function loadChunks() {
+  if (loading || loaded >= SEARCH_CHUNKS.length) return;
+  loading = true;
+  var script = document.createElement("script");
+  script.src = SEARCH_CHUNKS[loaded];
+  script.onload = function () { loaded++; loading = false; search(); loadChunks(); };
+  document.head.appendChild(script);
+}
+function search() {
+  var query = document.getElementById("search").value.toLowerCase();
+  var results = document.getElementById("results");
+  results.innerHTML = "";
+  if (!query) return;
+  loadChunks();
+  var shown = 0;
+  for (var i = 0; i < entries.length && shown < 200; i++) {
+    if (entries[i][2].indexOf(query) === -1) continue;
+    var item = document.createElement("li");
+    var link = document.createElement("a");
+    link.href = entries[i][1];
+    link.textContent = entries[i][0];
+    item.appendChild(link);
+    results.appendChild(item);
+    shown++;
+  }
+}
+"""
+
+
+def xml_text(value):
+    """Escape a value for XML character data, dropping characters XML cannot hold."""
+    text = _INVALID_XML_CHARS.sub("", str(value))
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def xml_attribute(value):
+    """xml_text() plus escaped double quotes, for use inside a double-quoted attribute."""
+    return xml_text(value).replace('"', "&quot;")
+
+
+def xml_name(key):
+    """
+    Turn a metadata key into a valid XML element name, e.g.
+    "Checksum (MD5)" -> "Checksum_MD5" and "EXIF: Image Make" -> "EXIF_Image_Make".
+    """
+    name = _INVALID_NAME_CHARS.sub("_", _INVALID_XML_CHARS.sub("", str(key))).strip("_") or "_"
+    if not (name[0].isalpha() or name[0] == "_") or name.lower().startswith("xml"):
+        name = "_" + name
+    return name
+
+
+class XmlWriter:
+    """
+    Incremental XML writer for metadata records.
+
+    Each write() formats one record as an element and appends it to the
+    file, so memory use does not depend on the number of records. Keys are
+    turned into element names with xml_name(); when that changes more than
+    the spaces, the original key is kept in a "key" attribute.
+    """
+
+    def __init__(self, file_path, root="Metadata_Collection", element="File", indent="  "):
+        self.file = open(file_path, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE)
+        self.root = root
+        self.element = element
+        self.indent = indent
+        self.count = 0
+        self.names = {}
+        self.file.write(XML_DECLARATION)
+        self.file.write(f"<{root}>\n")
+
+    def _name(self, key):
+        # Records share most of their keys, so sanitize each key once
+        name = self.names.get(key)
+        if name is None:
+            element = xml_name(key)
+            attribute = "" if element == str(key).replace(" ", "_") else f' key="{xml_attribute(key)}"'
+            name = self.names[key] = (element, attribute)
+        return name
+
+    def _fields(self, record, depth):
+        padding = self.indent * depth
+        lines = []
+        for key, value in record.items():
+            element, attribute = self._name(key)
+            text = xml_text(value)
+            if text:
+                lines.append(f"{padding}<{element}{attribute}>{text}</{element}>\n")
+            else:
+                lines.append(f"{padding}<{element}{attribute}/>\n")
+        return lines
+
+    def write(self, record):
+        self.count += 1
+        lines = [f'{self.indent}<{self.element} id="{self.count}">\n']
+        lines.extend(self._fields(record, 2))
+        lines.append(f"{self.indent}</{self.element}>\n")
+        self.file.write("".join(lines))
+
+    def write_fields(self, record):
+        """Write the fields of record directly under the root element."""
+        self.file.write("".join(self._fields(record, 1)))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.write(f"</{self.root}>\n")
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export_xml(records, file_path):
+    """Write an iterable of metadata dicts as <File> elements; returns the number written."""
+    with XmlWriter(file_path) as writer:
+        for record in records:
+            writer.write(record)
+        return writer.count
+
+
+def export_xml_document(metadata, file_path):
+    """Write the metadata of a single file as the children of a <Metadata> element."""
+    with XmlWriter(file_path, root="Metadata") as writer:
+        writer.write_fields(metadata)
+
+
+def _csv_value(value):
+    # Containers such as GPS tuples are written as JSON, whichever the layout
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+
+class CsvWriter:
+    """
+    Incremental CSV writer for metadata records.
+
+    The "wide" layout needs every column before the header can be written,
+    so records are spooled to a temporary JSONL file next to the output
+    while the field names are collected, and close() writes the CSV from
+    the spool in a second sequential pass. The "long" layout writes a
+    (File Path, Field, Value) row per field straight away and needs no
+    schema at all; the path is the key column, so it is not repeated as a
+    field.
+    """
+
+    def __init__(self, file_path, layout="wide"):
+        if layout not in CSV_LAYOUTS:
+            raise ValueError(f"Unsupported CSV layout: {layout}")
+
+        self.file_path = file_path
+        self.layout = layout
+        self.count = 0
+        self.fieldnames = {}
+        self.file = None
+        self.spool = None
+
+        if layout == "long":
+            self.file = open(file_path, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE)
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(LONG_CSV_FIELDS)
+        else:
+            self.spool = tempfile.TemporaryFile(
+                'w+', encoding='utf-8', suffix='.jsonl', dir=os.path.dirname(os.path.abspath(file_path))
+            )
+
+    def write(self, record):
+        self.count += 1
+        if self.layout == "long":
+            path = record.get('File Path', f"File {self.count}")
+            self.writer.writerows(
+                (path, key, _csv_value(value)) for key, value in record.items() if key != 'File Path'
+            )
+        else:
+            # A dict keeps the fields in order and ignores repeats
+            self.fieldnames.update(dict.fromkeys(record))
+            self.spool.write(json.dumps({key: _csv_value(value) for key, value in record.items()}, default=str))
+            self.spool.write("\n")
+
+    def close(self):
+        if self.spool is not None:
+            spool, self.spool = self.spool, None
+            with spool, open(self.file_path, 'w', newline='', encoding='utf-8',
+                             buffering=EXPORT_BUFFER_SIZE) as f:
+                # Every key is in the schema, so skip DictWriter's per-row check for extra keys
+                writer = csv.DictWriter(f, fieldnames=sorted(self.fieldnames), extrasaction='ignore')
+                if self.fieldnames:
+                    writer.writeheader()
+                spool.seek(0)
+                for line in spool:
+                    writer.writerow(json.loads(line))
+
+        elif self.file is not None and not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export_csv(records, file_path, layout="wide"):
+    """Write an iterable of metadata dicts as CSV; returns the number of records written."""
+    with CsvWriter(file_path, layout) as writer:
+        for record in records:
+            writer.write(record)
+        return writer.count
+
+
+def _html_head(title):
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n<style>\n{HTML_STYLE}</style>\n</head>\n<body>\n"
+    )
+
+
+def _html_table(record):
+    rows = "".join(
+        f"<tr><td>{html.escape(str(key))}</td><td>{html.escape(str(value))}</td></tr>\n"
+        for key, value in sorted(record.items())
+    )
+    return f"<table>\n<tr><th>Property</th><th>Value</th></tr>\n{rows}</table>\n"
+
+
+def _html_nav(links):
+    return "<nav>" + "".join(f'<a href="{href}">{html.escape(text)}</a>' for text, href in links) + "</nav>\n"
+
+
+class HtmlReportWriter:
+    """
+    Incremental HTML report split into pages of page_size files.
+
+    file_path becomes the index page; the pages and their search chunks go
+    into a "<name>_files" directory next to it. Each page is written as its
+    records arrive and closed once the next page starts, so the report can
+    be produced while extraction is still running. The index page, with
+    the page list and a search box over all pages, is written by close().
+    """
+
+    def __init__(self, file_path, page_size=HTML_PAGE_SIZE, title="Metadata Report"):
+        self.file_path = file_path
+        self.page_size = max(1, page_size)
+        self.title = title
+        self.count = 0
+        self.created = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        self.pages_name = os.path.splitext(os.path.basename(file_path))[0] + "_files"
+        self.pages_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), self.pages_name)
+        os.makedirs(self.pages_dir, exist_ok=True)
+
+        # (page file, search chunk file, file count, first file name, last file name)
+        self.pages = []
+        self.page = None
+        self.page_count = 0
+        self.search_entries = []
+        self.closed = False
+
+    @staticmethod
+    def _page_file(number):
+        return f"page-{number:04d}.html"
+
+    def _open_page(self):
+        number = len(self.pages) + 1
+        page_file = self._page_file(number)
+        self.page = open(os.path.join(self.pages_dir, page_file), 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE)
+        self.page_count = 0
+        self.first_name = None
+
+        links = [("Index", "../" + quote(os.path.basename(self.file_path)))]
+        if number > 1:
+            links.append(("Previous", self._page_file(number - 1)))
+        self.page.write(_html_head(f"{self.title} - Page {number}"))
+        self.page.write(f"<h1>{html.escape(self.title)} - Page {number}</h1>\n")
+        self.page.write(_html_nav(links))
+
+    def _close_page(self, has_next):
+        number = len(self.pages) + 1
+        search_file = f"search-{number:04d}.js"
+        with open(os.path.join(self.pages_dir, search_file), 'w', encoding='utf-8') as f:
+            f.write(f"fileScopeSearch({json.dumps(self.search_entries)});\n")
+        self.search_entries = []
+
+        links = [("Index", "../" + quote(os.path.basename(self.file_path)))]
+        if number > 1:
+            links.append(("Previous", self._page_file(number - 1)))
+        if has_next:
+            links.append(("Next", self._page_file(number + 1)))
+        self.page.write(_html_nav(links))
+        self.page.write("</body>\n</html>\n")
+        self.page.close()
+        self.page = None
+
+        self.pages.append((self._page_file(number), search_file, self.page_count, self.first_name, self.last_name))
+
+    def write(self, record):
+        # A full page is only closed when another record arrives, so its
+        # "Next" link never points at a page that will not exist
+        if self.page is not None and self.page_count >= self.page_size:
+            self._close_page(has_next=True)
+        if self.page is None:
+            self._open_page()
+
+        self.count += 1
+        self.page_count += 1
+        anchor = f"file-{self.count}"
+        name = str(record.get('File Name', f"File {self.count}"))
+        if self.first_name is None:
+            self.first_name = name
+        self.last_name = name
+
+        self.page.write(f'<h2 id="{anchor}">{html.escape(name)}</h2>\n{_html_table(record)}<br>\n')
+
+        text = " ".join(str(record[field]) for field in HTML_SEARCH_FIELDS if field in record)
+        page_file = self._page_file(len(self.pages) + 1)
+        self.search_entries.append([name, f"{quote(self.pages_name)}/{page_file}#{anchor}", text.lower()])
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.page is not None:
+            self._close_page(has_next=False)
+
+        pages_url = quote(self.pages_name)
+        chunks = [f"{pages_url}/{search_file}" for _, search_file, _, _, _ in self.pages]
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            f.write(_html_head(self.title))
+            f.write(f"<h1>{html.escape(self.title)}: {self.created}</h1>\n")
+            f.write(f"<p>{self.count} files in {len(self.pages)} pages</p>\n")
+            f.write('<input id="search" type="search" placeholder="Search files..." oninput="search()">\n')
+            f.write('<ul id="results"></ul>\n')
+            f.write("<table>\n<tr><th>Page</th><th>Files</th><th>First File</th><th>Last File</th></tr>\n")
+            for number, (page_file, _, count, first_name, last_name) in enumerate(self.pages, 1):
+                f.write(
+                    f'<tr><td><a href="{pages_url}/{page_file}">Page {number}</a></td><td>{count}</td>'
+                    f"<td>{html.escape(first_name)}</td><td>{html.escape(last_name)}</td></tr>\n"
+                )
+            f.write("</table>\n")
+            f.write(f"<script>\nvar SEARCH_CHUNKS = {json.dumps(chunks)};\n{HTML_SEARCH_SCRIPT}</script>\n")
+            f.write("</body>\n</html>\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export_html(records, file_path, page_size=HTML_PAGE_SIZE):
+    """Write an iterable of metadata dicts as a paged HTML report; returns the number written."""
+    with HtmlReportWriter(file_path, page_size) as writer:
+        for record in records:
+            writer.write(record)
+        return writer.count
+
+
+def export_html_document(metadata, file_path):
+    """Write the metadata of a single file as one HTML page."""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(_html_head("Metadata Report"))
+        f.write(f"<h1>Metadata Report: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</h1>\n")
+        f.write(_html_table(metadata))
+        f.write("</body>\n</html>\n")
+
+
+def export_format_available(format_type):
+    """False for export formats whose optional dependency is not installed."""
+    return HAS_PYARROW or format_type not in COLUMNAR_FORMATS
+
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("Parquet and Arrow export need the pyarrow package (pip install pyarrow)")
+
+
+def columnar_schema():
+    _require_pyarrow()
+    fields = [pa.field(name, pa.string()) for name in COLUMNAR_STRING_FIELDS]
+    fields += [pa.field(name, pa.int64()) for name in COLUMNAR_INT_FIELDS]
+    fields += [pa.field(name, pa.float64()) for name in COLUMNAR_FLOAT_FIELDS + COLUMNAR_GPS_FIELDS]
+    fields += [pa.field(name, pa.timestamp('s')) for name in COLUMNAR_TIMESTAMP_FIELDS]
+    fields.append(pa.field(COLUMNAR_MAP_FIELD, pa.map_(pa.string(), pa.string())))
+    return pa.schema(fields)
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _gps(value):
+    if isinstance(value, str) and ',' in value:
+        lat, lon = value.split(',', 1)
+        return _as_float(lat), _as_float(lon)
+    return None, None
+
+
+class ColumnarWriter:
+    """
+    Incremental Parquet or Arrow IPC writer for metadata records.
+
+    Rows are buffered column by column and written every row_group_size
+    records, as one Parquet row group or Arrow record batch, so memory use
+    is bounded by the row group. Common fields get typed columns (see the
+    COLUMNAR_* constants); the sparse remainder, such as EXIF tags, goes
+    into a string-to-string map column.
+
+    Raises ImportError when pyarrow is not installed.
+    """
+
+    def __init__(self, file_path, format_type='.parquet', row_group_size=COLUMNAR_ROW_GROUP_SIZE):
+        if format_type not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {format_type}")
+
+        self.schema = columnar_schema()
+        self.row_group_size = max(1, row_group_size)
+        self.count = 0
+        self.typed_fields = set(self.schema.names)
+
+        if format_type == '.parquet':
+            self.writer = pq.ParquetWriter(file_path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(file_path, self.schema)
+        self._reset()
+
+    def _reset(self):
+        self.columns = {name: [] for name in self.schema.names}
+        self.rows = 0
+
+    def write(self, record):
+        columns = self.columns
+        for name in COLUMNAR_STRING_FIELDS:
+            value = record.get(name)
+            columns[name].append(None if value is None else str(value))
+        for name in COLUMNAR_INT_FIELDS:
+            columns[name].append(_as_int(record.get(name)))
+        for name in COLUMNAR_FLOAT_FIELDS:
+            columns[name].append(_as_float(record.get(name)))
+        for name in COLUMNAR_TIMESTAMP_FIELDS:
+            # Parsed per row group with pyarrow.compute.strptime
+            value = record.get(name)
+            columns[name].append(None if value is None else str(value))
+
+        latitude, longitude = _gps(record.get('GPS Coordinates'))
+        columns['GPS Latitude'].append(latitude)
+        columns['GPS Longitude'].append(longitude)
+
+        # Coordinates that did not parse ("Not Available") stay in the map
+        skip = self.typed_fields | {'GPS Coordinates'} if latitude is not None else self.typed_fields
+        columns[COLUMNAR_MAP_FIELD].append([
+            (str(key), str(value)) for key, value in record.items() if key not in skip
+        ])
+
+        self.count += 1
+        self.rows += 1
+        if self.rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+
+        arrays = []
+        for field in self.schema:
+            values = self.columns[field.name]
+            if field.name in COLUMNAR_TIMESTAMP_FIELDS:
+                arrays.append(pc.strptime(
+                    pa.array(values, pa.string()), format=COLUMNAR_TIMESTAMP_FIELDS[field.name],
+                    unit='s', error_is_null=True
+                ))
+            else:
+                arrays.append(pa.array(values, field.type))
+
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self._reset()
+
+    def close(self):
+        if self.writer is not None:
+            self.flush()
+            self.writer.close()
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export_columnar(records, file_path, format_type='.parquet', row_group_size=COLUMNAR_ROW_GROUP_SIZE):
+    """Write an iterable of metadata dicts as Parquet or Arrow IPC; returns the number written."""
+    with ColumnarWriter(file_path, format_type, row_group_size) as writer:
+        for record in records:
+            writer.write(record)
+        return writer.count
+
+
+def compression_from_path(file_path):
+    """Return the JSONL compression implied by a file extension (e.g. results.jsonl.gz), else 'none'."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1].lower(), 'none')
+
+
+def strip_compression_extension(file_path):
+    root, ext = os.path.splitext(file_path)
+    return root if ext.lower() in COMPRESSION_EXTENSIONS else file_path
+
+
+def json_line(record):
+    """Encode a record as one JSON line (bytes), with orjson when it is installed."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the json module handles
+            pass
+    return (json.dumps(record, default=str) + "\n").encode('utf-8')
+
+
+def _open_compressed(raw, compression):
+    # The returned stream never closes raw; JsonlWriter does that itself
+    if compression == 'gzip':
+        import gzip
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6)
+    if compression == 'xz':
+        import lzma
+        return lzma.LZMAFile(raw, 'wb')
+    if compression == 'zstd':
+        if not HAS_ZSTANDARD:
+            raise ImportError("zstd compression needs the zstandard package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+    if compression == 'none':
+        return None
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class JsonlWriter:
+    """
+    Incremental JSON lines writer, one record per line.
+
+    Lines are encoded with orjson when it is installed and compressed as a
+    stream (gzip, xz or zstd); by default the compression follows the file
+    extension. With max_bytes the output is rotated once a file holds about
+    that many bytes on disk: results.jsonl.gz is followed by
+    results-0001.jsonl.gz, results-0002.jsonl.gz and so on. Compressors
+    buffer their output, so a compressed file may overshoot max_bytes by
+    up to one compressor buffer (larger for xz than for gzip or zstd).
+    """
+
+    def __init__(self, file_path, compression=None, max_bytes=None):
+        if compression is None:
+            compression = compression_from_path(file_path)
+        if compression not in JSONL_COMPRESSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self.file_path = file_path
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.count = 0
+        self.paths = []
+        self.raw = None
+        self.stream = None
+        self._open_part()
+
+    def part_path(self, index):
+        if index == 0:
+            return self.file_path
+        root, compression_ext = os.path.splitext(self.file_path)
+        if compression_ext.lower() not in COMPRESSION_EXTENSIONS:
+            root, compression_ext = self.file_path, ""
+        root, ext = os.path.splitext(root)
+        return f"{root}-{index:04d}{ext}{compression_ext}"
+
+    def _open_part(self):
+        path = self.part_path(len(self.paths))
+        self.raw = open(path, 'wb', buffering=EXPORT_BUFFER_SIZE)
+        try:
+            self.stream = _open_compressed(self.raw, self.compression) or self.raw
+        except BaseException:
+            self.raw.close()
+            raise
+        self.paths.append(path)
+
+    def _close_part(self):
+        if self.stream is not self.raw:
+            self.stream.close()
+        self.raw.close()
+
+    def write(self, record):
+        if self.max_bytes and self.count and self.raw.tell() >= self.max_bytes:
+            self._close_part()
+            self._open_part()
+        self.stream.write(json_line(record))
+        self.count += 1
+
+    def close(self):
+        if not self.raw.closed:
+            self._close_part()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export_jsonl(records, file_path, compression=None, max_bytes=None):
+    """Write an iterable of metadata dicts as JSON lines; returns the number written."""
+    with JsonlWriter(file_path, compression, max_bytes) as writer:
+        for record in records:
+            writer.write(record)
+        return writer.count
@@ -0,0 +1,125 @@
+import os
+
+from lazy_imports import is_available
+
+
+# Cost classes, used by batch runs to schedule extractors
+COST_CHEAP = "cheap"  # reads headers or a few bytes
+COST_FULL = "full"  # parses or decodes most of the file
+COST_CLASSES = (COST_CHEAP, COST_FULL)
+
+# Extraction tiers, from the quickest inventory to a full analysis
+TIER_STAT = 0  # stat fields only, the file is never opened
+TIER_HEADER = 1  # adds content sniffing and extractors that only read headers
+TIER_FULL = 2  # adds checksums and extractors that read the whole file
+EXTRACTION_TIERS = (TIER_STAT, TIER_HEADER, TIER_FULL)
+
+
+class Extractor:
+    """
+    A type-specific metadata extractor.
+
+    func is called as func(file_path, head), where head holds the first
+    bytes of the file when they have already been read (or None), and
+    returns a dict of metadata. dependencies are module names that must be
+    importable for the extractor to run, and tier is the lowest extraction
+    tier the extractor runs at.
+    """
+
+    def __init__(self, name, func, category, extensions=(), mime_types=(), cost=COST_CHEAP, dependencies=(),
+                 tier=TIER_HEADER):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unsupported cost class: {cost}")
+        if tier not in EXTRACTION_TIERS:
+            raise ValueError(f"Unsupported extraction tier: {tier}")
+
+        self.name = name
+        self.func = func
+        self.category = category
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.mime_types = tuple(mime.lower() for mime in mime_types)
+        self.cost = cost
+        self.dependencies = tuple(dependencies)
+        self.tier = tier
+        self._available = None
+
+    @property
+    def available(self):
+        if self._available is None:
+            self._available = all(is_available(module) for module in self.dependencies)
+        return self._available
+
+    def __call__(self, file_path, head=None):
+        return self.func(file_path, head)
+
+    def __repr__(self):
+        return f"<Extractor {self.name} ({self.category}, {self.cost})>"
+
+
+class ExtractorRegistry:
+    """
+    Dispatch table from file extensions and MIME types to extractors.
+
+    Lookups are dict hits on the extension, falling back to the exact MIME
+    type and then to a "type/*" wildcard. Registering an extension or MIME
+    type that is already taken replaces the earlier extractor, so plugins
+    can override the built-in ones.
+    """
+
+    def __init__(self):
+        self.extractors = {}
+        self.by_extension = {}
+        self.by_mime_type = {}
+
+    def register(self, name, func, category, extensions=(), mime_types=(), cost=COST_CHEAP, dependencies=(),
+                 tier=TIER_HEADER):
+        extractor = Extractor(name, func, category, extensions, mime_types, cost, dependencies, tier)
+
+        if name in self.extractors:
+            self.unregister(name)
+
+        self.extractors[name] = extractor
+        for ext in extractor.extensions:
+            self.by_extension[ext] = extractor
+        for mime_type in extractor.mime_types:
+            self.by_mime_type[mime_type] = extractor
+        return extractor
+
+    def extractor(self, name, category, extensions=(), mime_types=(), cost=COST_CHEAP, dependencies=(),
+                  tier=TIER_HEADER):
+        """Decorator form of register()."""
+        def decorator(func):
+            self.register(name, func, category, extensions, mime_types, cost, dependencies, tier)
+            return func
+        return decorator
+
+    def unregister(self, name):
+        extractor = self.extractors.pop(name, None)
+        if extractor is None:
+            return
+
+        self.by_extension = {ext: e for ext, e in self.by_extension.items() if e is not extractor}
+        self.by_mime_type = {mime: e for mime, e in self.by_mime_type.items() if e is not extractor}
+
+    def for_extension(self, ext):
+        return self.by_extension.get(ext.lower())
+
+    def for_mime_type(self, mime_type):
+        if not mime_type:
+            return None
+        mime_type = mime_type.split(";")[0].strip().lower()
+        extractor = self.by_mime_type.get(mime_type)
+        if extractor is None:
+            extractor = self.by_mime_type.get(mime_type.split("/")[0] + "/*")
+        return extractor
+
+    def lookup(self, file_path, mime_type=None):
+        """Return the extractor for a file, or None if no extractor handles it."""
+        extractor = self.for_extension(os.path.splitext(file_path)[1])
+        if extractor is None:
+            extractor = self.for_mime_type(mime_type)
+        return extractor
+
+    def cost(self, file_path, mime_type=None):
+        extractor = self.lookup(file_path, mime_type)
+        return extractor.cost if extractor is not None else COST_CHEAP
@@ -1,12 +1,75 @@
 import os
+import time
 import threading
-from queue import Queue
-from metadata_extractors import extract_metadata
+from queue import Queue, Empty, Full
+from metadata_extractors import extract_metadata, cache_profile, registry
+from extractor_registry import COST_FULL, TIER_STAT, TIER_FULL, EXTRACTION_TIERS
+from file_walker import DirectoryWalker
+import metadata_stripper
+from lazy_imports import lazy_import
+
+# Only needed by the process and auto backends
+concurrent_futures = lazy_import("concurrent.futures")
+
+
+BATCH_BACKENDS = ("thread", "process", "auto")
+
+
+def _extract(path, calc_checksums, tier, escalate=None, cache=None, verify_hashes=False, stat_result=None):
+    metadata = extract_metadata(
+        path, calc_checksums, cache=cache, verify_hashes=verify_hashes, tier=tier, stat_result=stat_result
+    )
+    if escalate and tier < TIER_FULL and 'Error' not in metadata:
+        if FileFilter._matches_criteria(metadata, escalate):
+            metadata = extract_metadata(
+                path, calc_checksums, cache=cache, verify_hashes=verify_hashes, tier=TIER_FULL,
+                stat_result=stat_result
+            )
+    return metadata
+
+
+def _extract_chunk(items, calc_checksums, tier, escalate):
+    # Runs inside a worker process
+    return [
+        (path, _extract(path, calc_checksums, tier, escalate, stat_result=stat_result))
+        for path, stat_result in items
+    ]
 
 
 class BatchProcessor:
+    """
+    Extract metadata from many files in parallel.
+
+    The backend decides where extraction runs: "thread" uses worker threads
+    (best for I/O-bound work), "process" sends chunks of files to a process
+    pool so CPU-bound parsing is not serialized on the GIL, and "auto" sends
+    files whose extractor parses the whole file (COST_FULL) to the process
+    pool and header-only work to threads.
+
+    tier selects how much is extracted (see metadata_extractors.extract_metadata).
+    escalate is a list of FileFilter criteria: files extracted below
+    TIER_FULL that match all of them are extracted again at TIER_FULL, so a
+    quick inventory of a large tree only pays for a full analysis where it
+    is wanted.
+
+    With a sink, results are streamed instead of kept in memory: workers push
+    them into a bounded queue that a drain thread writes to the sink, and
+    workers block when the sink falls behind.
+
+    Directories passed to add_files or add_directory are walked in the
+    background and their files are queued while extraction is already
+    running. Queued items are (path, stat_result) pairs; the stat result of
+    a walked file comes from its DirEntry, so it is not stat'ed again.
+    """
+
+    def __init__(self, callback=None, max_workers=4, calc_checksums=True, cache=None, verify_hashes=False,
+                 backend="thread", chunk_size=16, sink=None, max_pending_results=1000, max_queued_files=10000,
+                 tier=TIER_FULL, escalate=None):
+        if backend not in BATCH_BACKENDS:
+            raise ValueError(f"Unsupported batch backend: {backend}")
+        if tier not in EXTRACTION_TIERS:
+            raise ValueError(f"Unsupported extraction tier: {tier}")
 
-    def __init__(self, callback=None, max_workers=4):
         self.queue = Queue()
         self.results = {}
         self.processed_count = 0
@@ -15,14 +78,74 @@ class BatchProcessor:
         self.callback = callback
         self.workers = []
         self.max_workers = max_workers
+        self.calc_checksums = calc_checksums
+        self.cache = cache
+        self.verify_hashes = verify_hashes
+        self.tier = tier
+        self.escalate = list(escalate) if escalate else None
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.process_pool = None
+        self.thread_queue = None
+        self.pending_chunks = set()
+        self.chunk_slots = None
+        self.sink = sink
+        self.max_pending_results = max_pending_results
+        self.result_queue = None
+        self.drainer = None
+        self.feeders = 0
+        self.max_queued_files = max_queued_files
+        self.feeding_stopped = threading.Event()
         self.lock = threading.Lock()
 
     def add_files(self, file_paths):
+        directories = []
         with self.lock:
             for path in file_paths:
                 if os.path.isfile(path):
-                    self.queue.put(path)
+                    self.queue.put((path, None))
+                    self.total_count += 1
+                elif os.path.isdir(path):
+                    directories.append(path)
+
+        for directory in directories:
+            self.add_directory(directory)
+
+    def add_directory(self, root, **walk_options):
+        """Queue every file below root; see DirectoryWalker for the options."""
+        walker = DirectoryWalker(root, **walk_options)
+        with self.lock:
+            self.feeders += 1
+            stopped = self.feeding_stopped
+
+        feeder = threading.Thread(target=self._feed, args=(walker, stopped))
+        feeder.daemon = True
+        feeder.start()
+
+    def _feed(self, walker, stopped):
+        # stopped is the event of the run this feeder belongs to; clear()
+        # replaces it, so a feeder from before a clear() never touches the new run
+        try:
+            for item in walker:
+                # Keep the input queue bounded so huge trees are not buffered in memory
+                while self.queue.qsize() >= self.max_queued_files and not stopped.is_set():
+                    time.sleep(0.01)
+                with self.lock:
+                    if stopped.is_set():
+                        break
+                    self.queue.put(item)
                     self.total_count += 1
+        except Exception as e:
+            print(f"Error walking directory: {e}")
+        finally:
+            with self.lock:
+                finished = False
+                if stopped is self.feeding_stopped:
+                    self.feeders -= 1
+                    finished = self._check_finished()
+
+            if finished:
+                self._finish()
 
     def start(self):
         if self.active:
@@ -32,63 +155,245 @@ class BatchProcessor:
         self.processed_count = 0
         self.results = {}
 
+        if self.sink is not None:
+            # A fresh queue, so a sentinel left over from an earlier run cannot end this one
+            self.result_queue = Queue(maxsize=self.max_pending_results)
+            self.drainer = threading.Thread(target=self._drain_results)
+            self.drainer.daemon = True
+            self.drainer.start()
+
+        if self.backend == "thread":
+            self.thread_queue = self.queue
+            self._start_threads(self.max_workers if self.feeders else min(self.max_workers, self.total_count))
+        else:
+            # Bound the number of chunks queued in the pool so large batches don't pile up futures
+            self.process_pool = concurrent_futures.ProcessPoolExecutor(max_workers=self.max_workers)
+            self.chunk_slots = threading.BoundedSemaphore(self.max_workers * 2)
+
+            if self.backend == "auto":
+                self.thread_queue = Queue()
+                self._start_threads(self.max_workers)
+
+            dispatcher = threading.Thread(target=self._dispatcher)
+            dispatcher.daemon = True
+            dispatcher.start()
+            self.workers.append(dispatcher)
+
+        # Nothing was queued, e.g. the walked directories held no files
+        with self.lock:
+            finished = self._check_finished()
+        if finished:
+            self._finish()
+
+    def _start_threads(self, count):
         # Create and start worker threads
-        for _ in range(min(self.max_workers, self.total_count)):
+        for _ in range(count):
             worker = threading.Thread(target=self._worker)
             worker.daemon = True
             worker.start()
             self.workers.append(worker)
 
     def _worker(self):
+        source = self.thread_queue
         while self.active:
             try:
                 # Get file from queue with timeout to check active flag periodically
-                path = self.queue.get(timeout=0.5)
-
-                # Process the file
-                metadata = extract_metadata(path)
+                path, stat_result = source.get(timeout=0.5)
+            except Empty:
+                continue
 
-                # Store the result
-                with self.lock:
-                    self.results[path] = metadata
-                    self.processed_count += 1
+            try:
+                metadata = _extract(
+                    path, self.calc_checksums, self.tier, self.escalate,
+                    cache=self.cache, verify_hashes=self.verify_hashes, stat_result=stat_result
+                )
+            except Exception as e:
+                print(f"Error in worker thread: {e}")
+                metadata = {"Error": str(e)}
 
-                    # Call the callback with progress information
-                    if self.callback:
-                        progress = (self.processed_count / self.total_count) * 100
-                        self.callback(progress, self.processed_count, self.total_count)
+            self._record_result(path, metadata)
+            source.task_done()
 
-                # Mark task as done
+    def _dispatcher(self):
+        chunk = []
+        while self.active:
+            try:
+                item = self.queue.get(timeout=0.5)
+            except Empty:
+                item = None
+
+            if item is not None:
+                path, stat_result = item
+                if self.backend == "auto" and not self._is_cpu_bound(path):
+                    self.thread_queue.put(item)
+                else:
+                    metadata = self._cached(path, stat_result)
+                    if metadata is not None:
+                        self._record_result(path, metadata)
+                    else:
+                        chunk.append(item)
                 self.queue.task_done()
 
-                # Check if all files have been processed
-                if self.processed_count >= self.total_count:
-                    self.active = False
+            # Submit full chunks, or whatever we have once the queue runs dry
+            if chunk and (len(chunk) >= self.chunk_size or self.queue.empty()):
+                self._submit_chunk(chunk)
+                chunk = []
+
+    def _submit_chunk(self, chunk):
+        while self.active and not self.chunk_slots.acquire(timeout=0.5):
+            pass
+        if not self.active:
+            return
+
+        try:
+            future = self.process_pool.submit(_extract_chunk, chunk, self.calc_checksums, self.tier, self.escalate)
+        except Exception as e:
+            self.chunk_slots.release()
+            for path, _ in chunk:
+                self._record_result(path, {"Error": str(e)})
+            return
+
+        with self.lock:
+            self.pending_chunks.add(future)
+        future.add_done_callback(lambda f: self._chunk_done(f, chunk))
+
+    def _chunk_done(self, future, chunk):
+        with self.lock:
+            self.pending_chunks.discard(future)
+        self.chunk_slots.release()
+
+        if future.cancelled():
+            return
+
+        try:
+            results = future.result()
+        except Exception as e:
+            print(f"Error in worker process: {e}")
+            results = [(path, {"Error": str(e)}) for path, _ in chunk]
+
+        stat_results = dict(chunk)
+        for path, metadata in results:
+            if self.cache is not None and 'Error' not in metadata:
+                tier = metadata.get('Extraction Tier', self.tier)
+                self.cache.put(path, metadata, cache_profile(self.calc_checksums, tier), stat_results.get(path))
+            self._record_result(path, metadata)
+
+    def _cached(self, path, stat_result=None):
+        if self.cache is None or self.verify_hashes:
+            return None
+        return self.cache.get(path, cache_profile(self.calc_checksums, self.tier), stat_result)
+
+    def _is_cpu_bound(self, path):
+        # Extractors that parse or decode the whole file go to the process pool;
+        # a stat-only inventory never needs it
+        return self.tier > TIER_STAT and registry.cost(path) == COST_FULL
+
+    def _record_result(self, path, metadata):
+        if self.result_queue is not None and not self._put_result((path, metadata)):
+            return
+
+        # Store the result
+        with self.lock:
+            if self.result_queue is None:
+                self.results[path] = metadata
+            self.processed_count += 1
+
+            # Call the callback with progress information
+            if self.callback:
+                progress = (self.processed_count / self.total_count) * 100
+                self.callback(progress, self.processed_count, self.total_count)
 
-                    # Final callback
-                    if self.callback:
-                        self.callback(100, self.processed_count, self.total_count, finished=True)
+            finished = self._check_finished()
 
-            except Queue.Empty:
-                # Queue is empty, continue the loop
-                pass
+        if finished:
+            self._finish()
 
+    def _put_result(self, item):
+        # Blocks while the sink is behind, which throttles the workers, but
+        # gives up once the batch is stopped so no worker waits forever on a
+        # queue nobody drains any more
+        while True:
+            try:
+                self.result_queue.put(item, timeout=0.5)
+                return True
+            except Full:
+                if not self.active:
+                    return False
+
+    def _check_finished(self):
+        # Check if all files have been processed (caller holds the lock)
+        if self.active and self.feeders == 0 and self.processed_count >= self.total_count:
+            self.active = False
+            return True
+        return False
+
+    def _finish(self):
+        if self.cache is not None:
+            self.cache.flush()
+
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False)
+
+        if self.result_queue is not None:
+            # The drain thread sends the final callback once the sink is closed
+            self.result_queue.put(None)
+        else:
+            self._finished_callback()
+
+    def _finished_callback(self):
+        # Final callback
+        if self.callback:
+            self.callback(100, self.processed_count, self.total_count, finished=True)
+
+    def _drain_results(self):
+        finished = False
+        while True:
+            item = self.result_queue.get()
+            if item is None:
+                finished = self.processed_count >= self.total_count
+                break
+
+            path, metadata = item
+            try:
+                self.sink.write(path, metadata)
             except Exception as e:
-                print(f"Error in worker thread: {e}")
-                with self.lock:
-                    self.processed_count += 1
-                self.queue.task_done()
+                print(f"Error writing batch result: {e}")
+
+        try:
+            self.sink.close()
+        except Exception as e:
+            print(f"Error closing batch result sink: {e}")
+
+        if finished:
+            self._finished_callback()
 
     def stop(self):
         self.active = False
+        self.feeding_stopped.set()
+
+        if self.process_pool is not None:
+            with self.lock:
+                pending = list(self.pending_chunks)
+            for future in pending:
+                future.cancel()
+            self.process_pool.shutdown(wait=False)
+            self.process_pool = None
 
         # Wait for all worker threads to finish
         for worker in self.workers:
-            if worker.is_alive():
+            if worker.is_alive() and worker is not threading.current_thread():
                 worker.join(1.0)  # Wait with timeout
 
         self.workers = []
 
+        # Let the sink flush what was already produced
+        if self.drainer is not None:
+            if self.drainer.is_alive():
+                self.result_queue.put(None)
+                if self.drainer is not threading.current_thread():
+                    self.drainer.join()
+            self.drainer = None
+
     def get_results(self):
         return self.results
 
@@ -99,6 +404,9 @@ class BatchProcessor:
             self.results = {}
             self.processed_count = 0
             self.total_count = 0
+            # Feeders still running belong to the stopped run and no longer count
+            self.feeders = 0
+            self.feeding_stopped = threading.Event()
 
 
 class FileRemover:
@@ -109,47 +417,24 @@ class FileRemover:
             ext = os.path.splitext(file_path)[1].lower()
 
             if ext in ['.jpg', '.jpeg', '.png', '.tiff', '.webp']:
-                # Use PIL to strip metadata from image
-                from PIL import Image
-
-                # Open the image and get its data
-                with Image.open(file_path) as img:
-                    # Convert to RGB if RGBA (for PNG)
-                    if img.mode == 'RGBA' and ext != '.png':
-                        img = img.convert('RGB')
-
-                    # Create a new image with the same data but no metadata
-                    data = list(img.getdata())
-                    new_img = Image.new(img.mode, img.size)
-                    new_img.putdata(data)
-
-                    # Generate new filename
-                    base, extension = os.path.splitext(file_path)
-                    new_path = f"{base}_no_metadata{extension}"
+                # Generate new filename
+                base, extension = os.path.splitext(file_path)
+                new_path = f"{base}_no_metadata{extension}"
 
-                    # Save without metadata
-                    new_img.save(new_path)
+                # JPEG and PNG metadata is dropped without decoding the pixels
+                metadata_stripper.strip_image(file_path, new_path)
 
                 return new_path
 
             elif ext in ['.mp3', '.m4a', '.flac', '.ogg']:
                 # For audio files, need mutagen
                 try:
-                    import mutagen
-
                     # Generate new filename
                     base, extension = os.path.splitext(file_path)
                     new_path = f"{base}_no_metadata{extension}"
 
-                    # Copy the file
-                    import shutil
-                    shutil.copy2(file_path, new_path)
-
-                    # Remove tags
-                    audio = mutagen.File(new_path)
-                    if audio is not None:
-                        audio.delete()
-                        audio.save()
+                    # Copy the file and remove its tags
+                    metadata_stripper.strip_audio(file_path, new_path)
 
                     return new_path
                 except ImportError:
@@ -268,6 +553,17 @@ class FileFilter:
                     elif operator == 'ends_with':
                         if not field_value.lower().endswith(value.lower()):
                             return False
+                    elif operator in ('>', '<', '>=', '<='):
+                        # Numeric text compares as numbers; anything else compares as text,
+                        # which also orders the "YYYY-MM-DD HH:MM:SS" dates the extractors emit
+                        try:
+                            left, right = float(field_value), float(value)
+                        except ValueError:
+                            left, right = field_value, value
+                        if not FileFilter._ordered(left, operator, right):
+                            return False
+                    else:
+                        return False
                 else:
                     num_field_value = float(field_value) if isinstance(field_value, (int, float, str)) else 0
                     num_value = float(value) if isinstance(value, (int, float, str)) else 0
@@ -278,19 +574,23 @@ class FileFilter:
                     elif operator == '!=':
                         if num_field_value == num_value:
                             return False
-                    elif operator == '>':
-                        if num_field_value <= num_value:
-                            return False
-                    elif operator == '<':
-                        if num_field_value >= num_value:
-                            return False
-                    elif operator == '>=':
-                        if num_field_value < num_value:
-                            return False
-                    elif operator == '<=':
-                        if num_field_value > num_value:
+                    elif operator in ('>', '<', '>=', '<='):
+                        if not FileFilter._ordered(num_field_value, operator, num_value):
                             return False
+                    else:
+                        return False
             except (ValueError, TypeError):
                 return False
 
         return True
+
+    @staticmethod
+    def _ordered(left, operator, right):
+        """Apply an ordering operator (>, <, >=, <=) to two comparable values."""
+        if operator == '>':
+            return left > right
+        if operator == '<':
+            return left < right
+        if operator == '>=':
+            return left >= right
+        return left <= right
@@ -0,0 +1,209 @@
+import os
+import struct
+
+# (file type, extensions, signature) -- "??" in a signature matches any byte
+SIGNATURES = [
+    ("JPEG Image", (".jpg", ".jpeg", ".jpe", ".jfif"), "FF D8 FF"),
+    ("PNG Image", (".png",), "89 50 4E 47 0D 0A 1A 0A"),
+    ("GIF Image", (".gif",), "47 49 46 38"),
+    ("BMP Image", (".bmp", ".dib"), "42 4D"),
+    ("TIFF Image", (".tif", ".tiff", ".dng", ".nef", ".cr2", ".arw"), "49 49 2A 00"),
+    ("TIFF Image", (".tif", ".tiff", ".dng", ".nef", ".cr2", ".arw"), "4D 4D 00 2A"),
+    ("TIFF Image", (".tif", ".tiff"), "49 49 2B 00"),
+    ("TIFF Image", (".tif", ".tiff"), "4D 4D 00 2B"),
+    ("WebP Image", (".webp",), "52 49 46 46 ?? ?? ?? ?? 57 45 42 50"),
+    ("ICO Image", (".ico",), "00 00 01 00"),
+    ("PDF Document", (".pdf",), "25 50 44 46"),
+    ("RTF Document", (".rtf",), "7B 5C 72 74 66"),
+    ("MS Office Doc", (".doc", ".xls", ".ppt", ".msg", ".msi"), "D0 CF 11 E0"),
+    ("ZIP Archive", (".zip", ".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp", ".jar", ".apk", ".epub"),
+     "50 4B 03 04"),
+    ("ZIP Archive", (".zip",), "50 4B 05 06"),
+    ("ZIP Archive", (".zip",), "50 4B 07 08"),
+    ("RAR Archive", (".rar",), "52 61 72 21"),
+    ("7-Zip Archive", (".7z",), "37 7A BC AF 27 1C"),
+    ("GZIP Archive", (".gz", ".tgz"), "1F 8B"),
+    ("TAR Archive", (".tar",), "?? " * 257 + "75 73 74 61 72"),
+    ("MP3 Audio", (".mp3",), "49 44 33"),
+    ("MP3 Audio", (".mp3",), "FF FB"),
+    ("MP3 Audio", (".mp3",), "FF FA"),
+    ("MP3 Audio", (".mp3",), "FF F3"),
+    ("MP3 Audio", (".mp3",), "FF F2"),
+    ("FLAC Audio", (".flac",), "66 4C 61 43"),
+    ("OGG Media", (".ogg", ".oga", ".ogv", ".opus"), "4F 67 67 53"),
+    ("WAV Audio", (".wav",), "52 49 46 46 ?? ?? ?? ?? 57 41 56 45"),
+    ("AVI Video", (".avi",), "52 49 46 46 ?? ?? ?? ?? 41 56 49 20"),
+    ("MPEG-4 Media", (".mp4", ".m4a", ".m4v", ".mov", ".3gp", ".heic"), "?? ?? ?? ?? 66 74 79 70"),
+    ("MPEG-4 Media", (".mov",), "?? ?? ?? ?? 6D 6F 6F 76"),
+    ("MPEG-4 Media", (".mov",), "?? ?? ?? ?? 6D 64 61 74"),
+    ("MPEG-4 Media", (".mov",), "?? ?? ?? ?? 77 69 64 65"),
+    ("Matroska Video", (".mkv", ".webm"), "1A 45 DF A3"),
+    ("FLV Video", (".flv",), "46 4C 56"),
+    ("WMV Video", (".wmv", ".wma", ".asf"), "30 26 B2 75 8E 66 CF 11"),
+    ("Windows EXE", (".exe", ".dll", ".sys", ".scr"), "4D 5A"),
+    ("ELF Executable", ("", ".so", ".bin"), "7F 45 4C 46"),
+    ("SQLite Database", (".sqlite", ".db"), "53 51 4C 69 74 65 20 66 6F 72 6D 61 74 20 33 00"),
+    ("PHP Script", (".php",), "3C 3F 70 68 70"),
+    ("HTML Document", (".html", ".htm"), "3C 68 74 6D 6C"),
+    ("XML Document", (".xml", ".svg"), "3C 3F 78 6D 6C"),
+]
+
+# Extensions of plain text files. Text can start with the same bytes as a
+# short signature ("MZ", "BM", "ID3"), so these are never reported as a
+# mismatch while their content still decodes as text.
+TEXT_EXTENSIONS = (".txt", ".text", ".csv", ".tsv", ".log", ".md", ".ini", ".cfg", ".conf", ".json", ".yaml", ".yml")
+
+# Extensions whose files always start with one of the signatures above, so
+# content that matches none of them is a mismatch. Markup may open with a BOM,
+# doctype or whitespace, and .db/.bin are shared by many unrelated formats.
+_SIGNED_EXTENSIONS = frozenset(
+    extension
+    for file_type, extensions, _ in SIGNATURES
+    if file_type not in ("PHP Script", "HTML Document", "XML Document")
+    for extension in extensions
+) - {"", ".db", ".bin"} - set(TEXT_EXTENSIONS)
+
+# DIB header sizes of the BMP variants (core, info, v2-v5)
+_BMP_HEADER_SIZES = {12, 40, 52, 56, 64, 108, 124}
+
+
+def _valid_exe(head):
+    # The DOS header points at the PE header at offset 0x3C
+    if len(head) < 0x40:
+        return False
+    offset = struct.unpack_from("<I", head, 0x3C)[0]
+    if offset < 0x40 or offset > 0x10000:
+        return False
+    return len(head) < offset + 4 or head[offset:offset + 4] == b"PE\0\0"
+
+
+def _valid_bmp(head):
+    return len(head) >= 18 and struct.unpack_from("<I", head, 14)[0] in _BMP_HEADER_SIZES
+
+
+def _valid_mp3(head):
+    if not head.startswith(b"ID3"):
+        return True
+    # ID3v2.2-2.4 header: version, revision, flags, then a 28-bit size in 7-bit bytes
+    return len(head) >= 10 and 2 <= head[3] <= 4 and head[4] != 0xFF and all(b < 0x80 for b in head[6:10])
+
+
+# Extra header checks for signatures too short to be trusted on their own
+_VALIDATORS = {
+    "Windows EXE": _valid_exe,
+    "BMP Image": _valid_bmp,
+    "MP3 Audio": _valid_mp3,
+    "GZIP Archive": lambda head: len(head) > 2 and head[2] == 8,  # deflate
+    "FLV Video": lambda head: len(head) > 3 and head[3] == 1,  # version 1
+}
+
+_WILDCARD = None
+_TERMINAL = "match"
+
+
+def _compile(signatures):
+    # Byte trie: each node maps a byte to a child node, a run of wildcards is
+    # a single skip edge stored under _WILDCARD as {run length: child}, and
+    # nodes that end a signature store (specificity, type, extensions)
+    root = {}
+    for file_type, extensions, signature in signatures:
+        node = root
+        specificity = 0
+        skip = 0
+        for token in signature.split():
+            if token == "??":
+                skip += 1
+                continue
+            if skip:
+                node = node.setdefault(_WILDCARD, {}).setdefault(skip, {})
+                skip = 0
+            node = node.setdefault(int(token, 16), {})
+            specificity += 1
+        node[_TERMINAL] = (specificity, file_type, extensions)
+    return root
+
+
+_SIGNATURE_TRIE = _compile(SIGNATURES)
+
+# Bytes needed to match the longest signature
+SNIFF_SIZE = max(len(signature.split()) for _, _, signature in SIGNATURES)
+
+
+def identify_bytes(head):
+    """
+    Identify a file type from its leading bytes.
+
+    Returns (file type, extensions) for the most specific matching
+    signature, or None if nothing matches.
+    """
+    best = None
+    stack = [(_SIGNATURE_TRIE, 0)]
+    length = len(head)
+
+    while stack:
+        node, depth = stack.pop()
+
+        match = node.get(_TERMINAL)
+        if match is not None and (best is None or match[0] > best[0]):
+            validator = _VALIDATORS.get(match[1])
+            if validator is None or validator(head):
+                best = match
+
+        if depth >= length:
+            continue
+
+        child = node.get(head[depth])
+        if child is not None:
+            stack.append((child, depth + 1))
+        for skip, child in node.get(_WILDCARD, {}).items():
+            stack.append((child, depth + skip))
+
+    if best is None:
+        return None
+    return best[1], best[2]
+
+
+def looks_like_text(head):
+    """True if head has no NUL bytes and decodes as UTF-8 (allowing a character cut off at the end)."""
+    if b"\0" in head:
+        return False
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return e.reason == "unexpected end of data" and e.start >= len(head) - 3
+    return True
+
+
+def sniff_file(file_path, head=None):
+    """
+    Compare the type a file claims through its extension with the type
+    detected from its content.
+    """
+    if head is None:
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(SNIFF_SIZE)
+        except OSError:
+            head = b""
+
+    claimed = os.path.splitext(file_path)[1].lower()
+    detected = identify_bytes(head)
+
+    if detected is None:
+        # An empty or unreadable head proves nothing either way
+        return {
+            'Claimed Type': claimed or "None",
+            'Detected Type': "Unknown",
+            'Signature Mismatch': bool(head) and claimed in _SIGNED_EXTENSIONS,
+        }
+
+    file_type, extensions = detected
+    mismatch = claimed not in extensions
+    if mismatch and claimed in TEXT_EXTENSIONS and looks_like_text(head):
+        mismatch = False
+
+    return {
+        'Claimed Type': claimed or "None",
+        'Detected Type': file_type,
+        'Signature Mismatch': mismatch,
+    }
@@ -1,62 +1,202 @@
 import os
+import io
 import hashlib
 import datetime
-import magic
+import threading
 import json
-import csv
-import xml.dom.minidom as minidom
-import xml.etree.ElementTree as ET
+import mimetypes
+import exporters
 from constants import FILE_TYPES
+from lazy_imports import lazy_import, is_available
+
+# libmagic is loaded the first time a MIME type is needed
+magic = lazy_import("magic")
+HAS_MAGIC = is_available("magic")
 
 
 def get_file_extension(file_path):
     return os.path.splitext(file_path)[1].lower()
 
 
+_EXTENSION_CATEGORIES = {ext: category for category, extensions in FILE_TYPES.items() for ext in extensions}
+
+
 def get_file_type_category(file_path):
-    ext = get_file_extension(file_path)
+    return _EXTENSION_CATEGORIES.get(get_file_extension(file_path), "Other")
 
-    for category, extensions in FILE_TYPES.items():
-        if ext in extensions:
-            return category
 
-    return "Other"
+HASH_ALGORITHMS = ('md5', 'sha1', 'sha256')
+HASH_BUFFER_SIZE = 1024 * 1024
 
+# Number of leading bytes kept for content sniffing
+SNIFF_SIZE = 64 * 1024
 
-def calculate_checksum(file_path, algorithm='md5'):
-    try:
-        hasher = None
-        if algorithm.lower() == 'md5':
-            hasher = hashlib.md5()
-        elif algorithm.lower() == 'sha1':
-            hasher = hashlib.sha1()
-        elif algorithm.lower() == 'sha256':
-            hasher = hashlib.sha256()
-        else:
-            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+_hash_buffers = threading.local()
 
-        with open(file_path, 'rb') as f:
-            # Read and update hash in chunks to avoid memory issues with large files
-            for chunk in iter(lambda: f.read(4096), b""):
-                hasher.update(chunk)
 
-        return hasher.hexdigest()
+def _get_hash_buffer(size):
+    # One preallocated buffer per thread, reused across files
+    buffer = getattr(_hash_buffers, 'buffer', None)
+    if buffer is None or len(buffer) != size:
+        buffer = bytearray(size)
+        _hash_buffers.buffer = buffer
+    return buffer
+
+
+def calculate_checksums(file_path, algorithms=HASH_ALGORITHMS, buffer_size=HASH_BUFFER_SIZE):
+    return calculate_checksums_and_head(file_path, algorithms, buffer_size, head_size=0)[0]
+
+
+def calculate_checksums_and_head(file_path, algorithms=HASH_ALGORITHMS, buffer_size=HASH_BUFFER_SIZE,
+                                 head_size=SNIFF_SIZE):
+    """
+    Hash a file in one pass and also return its first head_size bytes,
+    so content sniffing does not have to read the file again.
+    """
+    algorithms = [algorithm.lower() for algorithm in algorithms]
+    head = bytearray()
+    try:
+        hashers = {}
+        for algorithm in algorithms:
+            if algorithm not in HASH_ALGORITHMS:
+                raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+            hashers[algorithm] = hashlib.new(algorithm)
+
+        buffer = _get_hash_buffer(buffer_size)
+        view = memoryview(buffer)
+        with open(file_path, 'rb', buffering=0) as f:
+            # Stream the file once and feed every digest from the same buffer
+            while True:
+                bytes_read = f.readinto(buffer)
+                if not bytes_read:
+                    break
+                chunk = view[:bytes_read]
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+                if len(head) < head_size:
+                    head += chunk[:head_size - len(head)]
+
+        checksums = {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+        return checksums, bytes(head)
     except Exception as e:
         print(f"Error calculating checksum: {e}")
-        return "Checksum calculation failed"
+        return {algorithm: "Checksum calculation failed" for algorithm in algorithms}, bytes(head)
+
+
+def calculate_checksum(file_path, algorithm='md5'):
+    return calculate_checksums(file_path, (algorithm,))[algorithm.lower()]
+
+
+def read_file_head(file_path, head_size=SNIFF_SIZE):
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(head_size)
+    except OSError:
+        return b""
+
+
+class BoundedReader(io.RawIOBase):
+    """
+    Raw binary reader that stops returning data once max_bytes have been
+    read. Seeking is free, so parsers can still follow offsets (e.g. TIFF
+    IFDs) anywhere in the file while the total I/O stays bounded.
+    """
+
+    def __init__(self, raw, max_bytes):
+        super().__init__()
+        self.raw = raw
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        remaining = self.max_bytes - self.bytes_read
+        if remaining <= 0:
+            return 0
+        bytes_read = self.raw.readinto(memoryview(buffer)[:remaining]) or 0
+        self.bytes_read += bytes_read
+        return bytes_read
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self.raw.seek(offset, whence)
+
+    def tell(self):
+        return self.raw.tell()
+
+    def close(self):
+        if not self.closed:
+            self.raw.close()
+        super().close()
+
+
+def open_bounded(file_path, max_bytes, buffer_size=4096):
+    """Open file_path for buffered reading of at most max_bytes (plus one buffer of read-ahead)."""
+    return io.BufferedReader(BoundedReader(open(file_path, 'rb', buffering=0), max_bytes), buffer_size)
+
+
+_magic_handles = threading.local()
+
+
+def get_magic_handle(mime=True):
+    # libmagic handles are expensive to create and not thread-safe, so keep one per thread
+    handles = getattr(_magic_handles, 'handles', None)
+    if handles is None:
+        handles = _magic_handles.handles = {}
+
+    handle = handles.get(mime)
+    if handle is None:
+        handle = magic.Magic(mime=mime)
+        handles[mime] = handle
+    return handle
 
 
 def get_file_mime_type(file_path):
     try:
-        mime = magic.Magic(mime=True)
-        return mime.from_file(file_path)
+        return get_magic_handle(mime=True).from_file(file_path)
+    except:
+        return "application/octet-stream"
+
+
+def guess_mime_type(file_path):
+    # From the extension alone, without opening the file
+    return mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+
+
+def get_buffer_mime_type(buffer):
+    try:
+        return get_magic_handle(mime=True).from_buffer(bytes(buffer))
     except:
         return "application/octet-stream"
 
 
-def get_file_info(file_path):
+def get_buffer_description(buffer):
+    try:
+        return get_magic_handle(mime=False).from_buffer(bytes(buffer))
+    except:
+        return "data"
+
+
+def get_file_info(file_path, head=None, sniff=True, stat_result=None):
+    """
+    Stat fields of a file. With sniff the MIME type comes from libmagic
+    (using head if given), otherwise it is guessed from the extension and
+    the file is never opened. stat_result saves the stat call when the
+    caller already has one, e.g. from a directory walk.
+    """
     try:
-        stat = os.stat(file_path)
+        stat = stat_result if stat_result is not None else os.stat(file_path)
+        if not sniff:
+            mime_type = guess_mime_type(file_path)
+        elif head is None:
+            mime_type = get_file_mime_type(file_path)
+        else:
+            mime_type = get_buffer_mime_type(head)
+
         file_info = {
             'File Name': os.path.basename(file_path),
             'File Path': os.path.abspath(file_path),
@@ -67,7 +207,7 @@ def get_file_info(file_path):
             'Accessed Date': format_timestamp(stat.st_atime),
             'File Extension': get_file_extension(file_path),
             'File Type Category': get_file_type_category(file_path),
-            'MIME Type': get_file_mime_type(file_path),
+            'MIME Type': mime_type,
         }
         return file_info
     except Exception as e:
@@ -91,78 +231,34 @@ def format_file_size(size_bytes):
         return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
 
 
-def export_metadata_to_file(metadata, file_path, format_type):
+def export_metadata_to_file(metadata, file_path, format_type, csv_layout="wide"):
     try:
         if format_type == '.json':
             with open(file_path, 'w') as f:
                 json.dump(metadata, f, indent=4)
 
+        elif format_type == '.jsonl':
+            # Compression follows the file name, e.g. results.jsonl.gz
+            exporters.export_jsonl([metadata] if isinstance(metadata, dict) else metadata, file_path)
+
         elif format_type == '.csv':
-            with open(file_path, 'w', newline='') as f:
-                if isinstance(metadata, list):
-                    if metadata:
-                        fieldnames = set()
-                        for meta in metadata:
-                            fieldnames.update(meta.keys())
-
-                        writer = csv.DictWriter(f, fieldnames=sorted(fieldnames))
-                        writer.writeheader()
-                        for meta in metadata:
-                            writer.writerow(meta)
-                else:
-                    writer = csv.DictWriter(f, fieldnames=sorted(metadata.keys()))
-                    writer.writeheader()
-                    writer.writerow(metadata)
+            exporters.export_csv([metadata] if isinstance(metadata, dict) else metadata, file_path, csv_layout)
 
         elif format_type == '.xml':
-            if isinstance(metadata, list):
-                root = ET.Element("Metadata_Collection")
-                for idx, meta in enumerate(metadata):
-                    file_elem = ET.SubElement(root, "File", id=str(idx + 1))
-                    for key, value in meta.items():
-                        elem = ET.SubElement(file_elem, key.replace(" ", "_"))
-                        elem.text = str(value)
+            # Records may come from a generator; they are written as they arrive
+            if isinstance(metadata, dict):
+                exporters.export_xml_document(metadata, file_path)
             else:
-                root = ET.Element("Metadata")
-                for key, value in metadata.items():
-                    elem = ET.SubElement(root, key.replace(" ", "_"))
-                    elem.text = str(value)
-
-            rough_string = ET.tostring(root, 'utf-8')
-            reparsed = minidom.parseString(rough_string)
-            with open(file_path, 'w') as f:
-                f.write(reparsed.toprettyxml(indent="  "))
+                exporters.export_xml(metadata, file_path)
 
         elif format_type == '.html':
-            with open(file_path, 'w') as f:
-                f.write("<!DOCTYPE html>\n<html>\n<head>\n")
-                f.write("<title>Metadata Report</title>\n")
-                f.write("<style>\n")
-                f.write("body { font-family: Arial, sans-serif; margin: 20px; }\n")
-                f.write("table { border-collapse: collapse; width: 100%; }\n")
-                f.write("th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }\n")
-                f.write("th { background-color: #f2f2f2; }\n")
-                f.write("tr:nth-child(even) { background-color: #f9f9f9; }\n")
-                f.write("h1 { color: #333; }\n")
-                f.write("</style>\n</head>\n<body>\n")
-
-                f.write(f"<h1>Metadata Report: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</h1>\n")
-
-                if isinstance(metadata, list):
-                    for idx, meta in enumerate(metadata):
-                        file_name = meta.get('File Name', f"File {idx + 1}")
-                        f.write(f"<h2>{file_name}</h2>\n")
-                        f.write("<table>\n<tr><th>Property</th><th>Value</th></tr>\n")
-                        for key, value in sorted(meta.items()):
-                            f.write(f"<tr><td>{key}</td><td>{value}</td></tr>\n")
-                        f.write("</table>\n<br>\n")
-                else:
-                    f.write("<table>\n<tr><th>Property</th><th>Value</th></tr>\n")
-                    for key, value in sorted(metadata.items()):
-                        f.write(f"<tr><td>{key}</td><td>{value}</td></tr>\n")
-                    f.write("</table>\n")
+            if isinstance(metadata, dict):
+                exporters.export_html_document(metadata, file_path)
+            else:
+                exporters.export_html(metadata, file_path)
 
-                f.write("</body>\n</html>")
+        elif format_type in exporters.COLUMNAR_FORMATS:
+            exporters.export_columnar([metadata] if isinstance(metadata, dict) else metadata, file_path, format_type)
 
         else:
             with open(file_path, 'w') as f:
@@ -0,0 +1,68 @@
+import io
+import mmap
+
+
+class FileView:
+    """
+    Read-only, memory-mapped view of a file.
+
+    Indexing and slicing return zero-copy memoryview slices of the mapping,
+    so large files can be previewed, hashed, scanned with re or handed to
+    numpy without being copied into the Python heap. Empty files, which
+    cannot be mapped, are exposed as an empty buffer.
+
+    Use as a context manager; close() leaves the mapping to the garbage
+    collector if slices of it are still in use.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.map = None
+
+        with open(file_path, 'rb') as f:
+            try:
+                # The mapping keeps its own handle to the file
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                pass
+
+        self.buffer = memoryview(self.map if self.map is not None else b"")
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def __getitem__(self, key):
+        return self.buffer[key]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def searchable(self):
+        """Object supporting find() and re matching without copies."""
+        return self.map if self.map is not None else b""
+
+    def find(self, sub, start=0, end=None):
+        if end is None:
+            end = len(self)
+        return self.searchable.find(sub, start, end)
+
+    def stream(self):
+        """File-like object over the mapping, positioned at the start."""
+        if self.map is None:
+            return io.BytesIO()
+        self.map.seek(0)
+        return self.map
+
+    def close(self):
+        try:
+            self.buffer.release()
+            if self.map is not None:
+                self.map.close()
+        except BufferError:
+            # Slices are still referenced elsewhere; the mapping is released
+            # once they are gone
+            pass
@@ -0,0 +1,201 @@
+import os
+import re
+import fnmatch
+import threading
+from queue import Queue, Empty, Full
+
+
+SYMLINK_POLICIES = ("skip", "files", "follow")
+
+_DONE = object()
+
+
+def _compile_patterns(patterns):
+    if not patterns:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    regex = "|".join(fnmatch.translate(os.path.normcase(pattern).replace("\\", "/")) for pattern in patterns)
+    return re.compile(regex)
+
+
+class DirectoryWalker:
+    """
+    Parallel recursive file finder built on os.scandir.
+
+    Directories are scanned by a pool of threads and matching files are
+    handed out through a bounded queue as soon as they are found, so a
+    consumer can start working before the traversal is finished. Each result
+    is a (path, stat_result) pair taken from the DirEntry, so callers do not
+    need to stat the file again.
+
+    Include/exclude globs are matched against the file name, or against the
+    path relative to the root when the pattern contains a separator.
+    Exclude patterns also prune directories.
+    """
+
+    def __init__(self, roots, include=None, exclude=None, symlinks="skip", max_depth=None,
+                 min_size=None, max_size=None, workers=4, max_pending=10000):
+        if symlinks not in SYMLINK_POLICIES:
+            raise ValueError(f"Unsupported symlink policy: {symlinks}")
+
+        if isinstance(roots, str):
+            roots = [roots]
+
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.include = _compile_patterns(include)
+        self.exclude = _compile_patterns(exclude)
+        self.symlinks = symlinks
+        self.max_depth = max_depth
+        self.min_size = min_size
+        self.max_size = max_size
+        self.workers = max(1, workers)
+
+        self.results = Queue(maxsize=max_pending)
+        self.directories = Queue()
+        self.pending_directories = 0
+        self.visited = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.threads = []
+
+    def __iter__(self):
+        self.start()
+        try:
+            while True:
+                item = self.results.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self.stop()
+
+    def start(self):
+        for root in self.roots:
+            try:
+                stat_result = os.stat(root)
+            except OSError as e:
+                print(f"Error accessing {root}: {e}")
+                continue
+
+            if os.path.isdir(root):
+                self._push_directory(root, root, 0, stat_result)
+            elif self._size_allowed(stat_result):
+                self._put((root, stat_result))
+
+        if self.pending_directories == 0:
+            self._put(_DONE)
+            return
+
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._scan_worker)
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self):
+        self.stopped.set()
+
+    def _push_directory(self, path, root, depth, stat_result=None):
+        if self.symlinks == "follow" and stat_result is not None:
+            # Following directory links can create cycles
+            key = (stat_result.st_dev, stat_result.st_ino)
+            with self.lock:
+                if key in self.visited:
+                    return
+                self.visited.add(key)
+
+        with self.lock:
+            self.pending_directories += 1
+        self.directories.put((path, root, depth))
+
+    def _scan_worker(self):
+        while not self.stopped.is_set():
+            try:
+                path, root, depth = self.directories.get(timeout=0.1)
+            except Empty:
+                continue
+
+            try:
+                self._scan_directory(path, root, depth)
+            except Exception as e:
+                print(f"Error scanning {path}: {e}")
+
+            with self.lock:
+                self.pending_directories -= 1
+                done = self.pending_directories == 0
+
+            if done:
+                self._put(_DONE)
+                # Wake up the other workers so they can exit
+                self.stopped.set()
+
+    def _scan_directory(self, path, root, depth):
+        try:
+            entries = os.scandir(path)
+        except OSError as e:
+            print(f"Error scanning {path}: {e}")
+            return
+
+        with entries:
+            for entry in entries:
+                if self.stopped.is_set():
+                    return
+
+                try:
+                    if self.symlinks == "skip" and entry.is_symlink():
+                        continue
+
+                    if entry.is_dir(follow_symlinks=self.symlinks == "follow"):
+                        if self.max_depth is not None and depth >= self.max_depth:
+                            continue
+                        if self._excluded(entry, root):
+                            continue
+                        # os.stat, not entry.stat(): the cycle check needs st_ino,
+                        # which DirEntry reports as 0 on Windows
+                        stat_result = os.stat(entry.path) if self.symlinks == "follow" else None
+                        self._push_directory(entry.path, root, depth + 1, stat_result)
+
+                    elif entry.is_file():
+                        if self._excluded(entry, root) or not self._included(entry, root):
+                            continue
+                        stat_result = entry.stat()
+                        if self._size_allowed(stat_result):
+                            self._put((entry.path, stat_result))
+                except OSError:
+                    # Broken links and entries removed mid-scan
+                    continue
+
+    def _put(self, item):
+        # Block while the consumer is behind, but give up once stopped
+        while not self.stopped.is_set():
+            try:
+                self.results.put(item, timeout=0.1)
+                return
+            except Full:
+                continue
+
+    def _matches(self, pattern, entry, root):
+        name = os.path.normcase(entry.name)
+        if pattern.match(name):
+            return True
+        relative = os.path.normcase(os.path.relpath(entry.path, root))
+        return pattern.match(relative.replace(os.sep, "/")) is not None
+
+    def _included(self, entry, root):
+        return self.include is None or self._matches(self.include, entry, root)
+
+    def _excluded(self, entry, root):
+        return self.exclude is not None and self._matches(self.exclude, entry, root)
+
+    def _size_allowed(self, stat_result):
+        if self.min_size is not None and stat_result.st_size < self.min_size:
+            return False
+        if self.max_size is not None and stat_result.st_size > self.max_size:
+            return False
+        return True
+
+
+def walk_files(roots, **options):
+    """Yield (path, stat_result) for every matching file below roots."""
+    return iter(DirectoryWalker(roots, **options))
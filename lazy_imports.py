@@ -0,0 +1,68 @@
+import importlib
+import importlib.util
+import threading
+
+
+_import_lock = threading.RLock()
+
+
+class LazyModule:
+    """
+    Placeholder for a module that is imported on first attribute access.
+
+    before_import runs once just before the import (e.g. to select a
+    matplotlib backend). A failed import is remembered and raised again on
+    every later access instead of being retried.
+    """
+
+    def __init__(self, name, before_import=None):
+        self.__dict__['_name'] = name
+        self.__dict__['_before_import'] = before_import
+        self.__dict__['_module'] = None
+        self.__dict__['_error'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is not None:
+            return module
+
+        with _import_lock:
+            if self._module is None:
+                if self._error is not None:
+                    raise type(self._error)(self._error.msg, name=self._error.name)
+                try:
+                    if self._before_import is not None:
+                        self._before_import()
+                    self.__dict__['_module'] = importlib.import_module(self._name)
+                except ImportError as e:
+                    # Keep a copy without the traceback, which would pin every
+                    # frame of the first caller (and whatever they reference)
+                    self.__dict__['_error'] = type(e)(e.msg, name=e.name)
+                    raise
+            return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name, before_import=None):
+    """Return a LazyModule for name; nothing is imported until it is used."""
+    return LazyModule(name, before_import)
+
+
+def is_available(name):
+    """Check whether a module can be found without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import weakref
+import file_utils
+
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".metadata_finder", "metadata_cache.db")
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# Metadata fields holding a digest that "verify hashes" can recompute
+CHECKSUM_FIELDS = {
+    'Checksum (MD5)': 'md5',
+    'Checksum (SHA1)': 'sha1',
+    'Checksum (SHA256)': 'sha256',
+}
+
+_COMMIT_INTERVAL = 256
+_EVICT_BATCH = 256
+
+
+def _close_connection(conn):
+    conn.commit()
+    conn.close()
+
+
+def stat_signature(stat_result):
+    # No inode: DirEntry.stat() reports st_ino as 0 on Windows, where it
+    # would never match the value from os.stat()
+    return stat_result.st_size, stat_result.st_mtime_ns
+
+
+class MetadataCache:
+    """
+    On-disk cache of extracted metadata backed by SQLite.
+
+    Entries are keyed by (path, profile) and are only returned while the
+    file's (size, mtime) signature is unchanged. The cache is bounded
+    by the total size of the stored records; the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_FILE, max_size=DEFAULT_CACHE_SIZE):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.conn = None
+        self.total_size = 0
+        self.pending_writes = 0
+
+        try:
+            cache_dir = os.path.dirname(db_path)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata_cache ("
+                " path TEXT NOT NULL,"
+                " profile TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " metadata TEXT NOT NULL,"
+                " nbytes INTEGER NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (path, profile))"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS metadata_cache_last_used ON metadata_cache (last_used)"
+            )
+            self.conn.commit()
+
+            row = self.conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM metadata_cache").fetchone()
+            self.total_size = row[0]
+
+            # Make sure batched writes reach the disk when the cache is
+            # garbage collected or at interpreter exit, without keeping it alive
+            self._finalizer = weakref.finalize(self, _close_connection, self.conn)
+        except Exception as e:
+            print(f"Error opening metadata cache: {e}")
+            self.conn = None
+
+    @property
+    def enabled(self):
+        return self.conn is not None
+
+    def get(self, file_path, profile="default", stat_result=None):
+        if not self.enabled:
+            return None
+
+        path = os.path.abspath(file_path)
+        try:
+            if stat_result is None:
+                stat_result = os.stat(path)
+
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT size, mtime_ns, metadata FROM metadata_cache WHERE path = ? AND profile = ?",
+                    (path, profile)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                if tuple(row[:2]) != stat_signature(stat_result):
+                    self._delete(path, profile)
+                    return None
+
+                self.conn.execute(
+                    "UPDATE metadata_cache SET last_used = ? WHERE path = ? AND profile = ?",
+                    (time.time(), path, profile)
+                )
+                self._written()
+
+            return json.loads(row[2])
+        except Exception as e:
+            print(f"Error reading metadata cache: {e}")
+            return None
+
+    def put(self, file_path, metadata, profile="default", stat_result=None):
+        if not self.enabled:
+            return
+
+        path = os.path.abspath(file_path)
+        try:
+            if stat_result is None:
+                stat_result = os.stat(path)
+
+            data = json.dumps(metadata, default=str)
+            size, mtime_ns = stat_signature(stat_result)
+
+            with self.lock:
+                self._delete(path, profile)
+                self.conn.execute(
+                    "INSERT INTO metadata_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, profile, size, mtime_ns, data, len(data), time.time())
+                )
+                self.total_size += len(data)
+                self._written()
+
+                if self.total_size > self.max_size:
+                    self._evict()
+        except Exception as e:
+            print(f"Error writing metadata cache: {e}")
+
+    def get_or_extract(self, file_path, extract_func, profile="default", verify_hashes=False, stat_result=None):
+        """
+        Return cached metadata for a file, extracting and storing it on a miss.
+
+        With verify_hashes, a cache hit is only trusted if the stored
+        checksums still match the file contents.
+        """
+        if stat_result is None:
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                return extract_func(file_path)
+
+        metadata = self.get(file_path, profile, stat_result)
+        if metadata is not None and (not verify_hashes or self._hashes_match(file_path, metadata)):
+            return metadata
+
+        metadata = extract_func(file_path)
+        if 'Error' not in metadata:
+            self.put(file_path, metadata, profile, stat_result)
+        return metadata
+
+    def invalidate(self, file_path):
+        if not self.enabled:
+            return
+
+        path = os.path.abspath(file_path)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(nbytes), 0) FROM metadata_cache WHERE path = ?", (path,)
+            ).fetchone()
+            self.conn.execute("DELETE FROM metadata_cache WHERE path = ?", (path,))
+            self.total_size -= row[0]
+            self._written()
+
+    def clear(self):
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self.conn.execute("DELETE FROM metadata_cache")
+            self.conn.commit()
+            self.total_size = 0
+            self.pending_writes = 0
+
+    def flush(self):
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self.conn.commit()
+            self.pending_writes = 0
+
+    def close(self):
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self._finalizer()
+            self.conn = None
+
+    def _hashes_match(self, file_path, metadata):
+        fields = {key: algorithm for key, algorithm in CHECKSUM_FIELDS.items() if key in metadata}
+        if not fields:
+            return True
+
+        checksums = file_utils.calculate_checksums(file_path, sorted(set(fields.values())))
+        return all(metadata[key] == checksums[algorithm] for key, algorithm in fields.items())
+
+    def _delete(self, path, profile):
+        row = self.conn.execute(
+            "SELECT nbytes FROM metadata_cache WHERE path = ? AND profile = ?", (path, profile)
+        ).fetchone()
+        if row is not None:
+            self.conn.execute("DELETE FROM metadata_cache WHERE path = ? AND profile = ?", (path, profile))
+            self.total_size -= row[0]
+
+    def _evict(self):
+        # Drop least recently used entries until the cache fits again
+        while self.total_size > self.max_size:
+            rows = self.conn.execute(
+                "SELECT path, profile, nbytes FROM metadata_cache ORDER BY last_used LIMIT ?",
+                (_EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                self.total_size = 0
+                break
+
+            for path, profile, nbytes in rows:
+                self.conn.execute("DELETE FROM metadata_cache WHERE path = ? AND profile = ?", (path, profile))
+                self.total_size -= nbytes
+                if self.total_size <= self.max_size:
+                    break
+
+        self.conn.commit()
+        self.pending_writes = 0
+
+    def _written(self):
+        self.pending_writes += 1
+        if self.pending_writes >= _COMMIT_INTERVAL:
+            self.conn.commit()
+            self.pending_writes = 0
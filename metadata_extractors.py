@@ -1,69 +1,152 @@
+import io
 import os
-import exifread
 import hashlib
 import datetime
 import mimetypes
-from PIL import Image
 import file_utils
-
-try:
-    import magic
-
-    HAS_MAGIC = True
-except ImportError:
-    HAS_MAGIC = False
-
-try:
-    import mutagen
-
-    HAS_MUTAGEN = True
-except ImportError:
-    HAS_MUTAGEN = False
-
-try:
-    import PyPDF2
-
-    HAS_PYPDF2 = True
-except ImportError:
-    HAS_PYPDF2 = False
-
-
-def extract_metadata(file_path, calc_checksums=True):
-    if not os.path.exists(file_path):
+import file_signatures
+from constants import FILE_TYPES
+from extractor_registry import (
+    ExtractorRegistry, COST_CHEAP, COST_FULL, TIER_STAT, TIER_FULL, EXTRACTION_TIERS
+)
+from lazy_imports import lazy_import, is_available
+
+# Parsers are only imported once a file of their type is processed
+exifread = lazy_import("exifread")
+Image = lazy_import("PIL.Image")
+mutagen = lazy_import("mutagen")
+PyPDF2 = lazy_import("PyPDF2")
+
+HAS_MUTAGEN = is_available("mutagen")
+HAS_PYPDF2 = is_available("PyPDF2")
+
+# Bytes an image extractor may read. EXIF segments and PNG text chunks sit
+# in the first few KB; TIFF-based files can place their IFDs anywhere, so
+# reads are capped rather than confined to the start of the file
+MAX_IMAGE_HEADER_READ = 256 * 1024
+
+
+def checksum_algorithms(calc_checksums=True):
+    """calc_checksums is either a flag for all algorithms or a list of algorithm names."""
+    if isinstance(calc_checksums, bool):
+        return file_utils.HASH_ALGORITHMS if calc_checksums else ()
+    if isinstance(calc_checksums, str):
+        calc_checksums = [calc_checksums]
+    return tuple(algorithm.lower() for algorithm in calc_checksums)
+
+
+def cache_profile(calc_checksums=True, tier=TIER_FULL):
+    if tier != TIER_FULL:
+        # Checksums are only calculated at the full tier
+        return f"tier{tier}"
+
+    algorithms = checksum_algorithms(calc_checksums)
+    if not algorithms:
+        return "basic"
+    if set(algorithms) == set(file_utils.HASH_ALGORITHMS):
+        return "checksums"
+    return "checksums:" + ",".join(sorted(set(algorithms)))
+
+
+def extract_metadata(file_path, calc_checksums=True, cache=None, verify_hashes=False, tier=TIER_FULL,
+                     stat_result=None):
+    """
+    Extract the metadata of a file up to the given extraction tier.
+
+    TIER_STAT only reports stat fields, TIER_HEADER also sniffs the content
+    and runs extractors that read file headers (EXIF, audio tags), and
+    TIER_FULL adds checksums and extractors that read the whole file. The
+    tier reached is stored under 'Extraction Tier', so a quick inventory
+    can be escalated later for the files that need it.
+
+    stat_result, e.g. from a directory walk, replaces the stat calls for
+    the cache lookup and the stat fields.
+    """
+    if tier not in EXTRACTION_TIERS:
+        raise ValueError(f"Unsupported extraction tier: {tier}")
+
+    if cache is not None:
+        return cache.get_or_extract(
+            file_path,
+            lambda path: extract_metadata(path, calc_checksums, tier=tier, stat_result=stat_result),
+            profile=cache_profile(calc_checksums, tier),
+            verify_hashes=verify_hashes,
+            stat_result=stat_result
+        )
+
+    if stat_result is None and not os.path.exists(file_path):
         return {"Error": "File does not exist"}
 
-    metadata = file_utils.get_file_info(file_path)
+    if tier == TIER_STAT:
+        metadata = file_utils.get_file_info(file_path, sniff=False, stat_result=stat_result)
+        metadata['Extraction Tier'] = tier
+        return metadata
 
-    if calc_checksums:
-        metadata['Checksum (MD5)'] = file_utils.calculate_checksum(file_path, 'md5')
-        metadata['Checksum (SHA1)'] = file_utils.calculate_checksum(file_path, 'sha1')
-        metadata['Checksum (SHA256)'] = file_utils.calculate_checksum(file_path, 'sha256')
+    # Hashing already reads the whole file, so keep its first bytes for content sniffing
+    algorithms = checksum_algorithms(calc_checksums) if tier == TIER_FULL else ()
+    if algorithms:
+        checksums, head = file_utils.calculate_checksums_and_head(file_path, algorithms)
+    else:
+        head = file_utils.read_file_head(file_path)
 
+    metadata = file_utils.get_file_info(file_path, head=head, stat_result=stat_result)
+    metadata.update(file_signatures.sniff_file(file_path, head))
 
-    file_type = file_utils.get_file_type_category(file_path)
+    for algorithm in algorithms:
+        metadata[f'Checksum ({algorithm.upper()})'] = checksums[algorithm]
 
-    if file_type == "Images":
-        image_metadata = extract_image_metadata(file_path)
-        metadata.update(image_metadata)
-    elif file_type == "Audio" and HAS_MUTAGEN:
-        audio_metadata = extract_audio_metadata(file_path)
-        metadata.update(audio_metadata)
-    elif file_type == "Video":
-        video_metadata = extract_video_metadata(file_path)
-        metadata.update(video_metadata)
-    elif file_type == "Documents":
-        doc_metadata = extract_document_metadata(file_path)
-        metadata.update(doc_metadata)
+    extractor = registry.lookup(file_path, metadata.get('MIME Type'))
+    if extractor is not None and extractor.available and extractor.tier <= tier:
+        metadata.update(extractor(file_path, head))
 
+    metadata['Extraction Tier'] = tier
     return metadata
 
 
-def extract_image_metadata(file_path):
+def extract_image_metadata(file_path, head=None):
+    """
+    Read EXIF tags and image properties from one bounded file handle.
+
+    Only the EXIF segment, PNG chunks before the image data or TIFF IFDs
+    are read (maker notes and thumbnails are skipped) and PIL never decodes
+    pixel data.
+    """
     metadata = {}
+    image_metadata = {}
 
     try:
-        with open(file_path, 'rb') as image_file:
-            tags = exifread.process_file(image_file)
+        image_file = file_utils.open_bounded(file_path, MAX_IMAGE_HEADER_READ)
+    except OSError as e:
+        return {'Image Data': f"Error extracting image data: {e}"}
+
+    with image_file:
+        exif_source = image_file
+        try:
+            with Image.open(image_file) as img:
+                image_metadata['Image Format'] = img.format
+                image_metadata['Image Mode'] = img.mode
+                image_metadata['Image Width'] = img.width
+                image_metadata['Image Height'] = img.height
+                image_metadata['Image Size'] = f"{img.width}x{img.height}"
+                image_metadata['Megapixels'] = round((img.width * img.height) / 1e6, 2)
+
+                for key, value in img.info.items():
+                    if isinstance(value, (str, int, float, bool)):
+                        image_metadata[f"Image Info: {key}"] = value
+
+                if img.format == 'PNG':
+                    # exifread would scan every chunk of the file for eXIf, which
+                    # PIL has already read since it must precede the image data
+                    exif = img.info.get('exif')
+                    exif_source = io.BytesIO(exif[6:] if exif.startswith(b"Exif\0\0") else exif) if exif else None
+        except Exception as e:
+            image_metadata['Image Data'] = f"Error extracting image data: {e}"
+
+        try:
+            tags = {}
+            if exif_source is not None:
+                exif_source.seek(0)
+                tags = exifread.process_file(exif_source, details=False, extract_thumbnail=False)
 
             for tag, value in tags.items():
                 if tag.startswith('JPEGThumbnail'):
@@ -80,24 +163,10 @@ def extract_image_metadata(file_path):
             metadata['F-Stop'] = str(tags.get('EXIF FNumber', 'Not Available'))
             metadata['ISO Speed'] = str(tags.get('EXIF ISOSpeedRatings', 'Not Available'))
             metadata['Focal Length'] = str(tags.get('EXIF FocalLength', 'Not Available'))
-    except Exception as e:
-        metadata['EXIF Data'] = f"Error extracting EXIF data: {e}"
-
-    try:
-        with Image.open(file_path) as img:
-            metadata['Image Format'] = img.format
-            metadata['Image Mode'] = img.mode
-            metadata['Image Width'] = img.width
-            metadata['Image Height'] = img.height
-            metadata['Image Size'] = f"{img.width}x{img.height}"
-            metadata['Megapixels'] = round((img.width * img.height) / 1e6, 2)
-
-            for key, value in img.info.items():
-                if isinstance(value, (str, int, float, bool)):
-                    metadata[f"Image Info: {key}"] = value
-    except Exception as e:
-        metadata['Image Data'] = f"Error extracting image data: {e}"
+        except Exception as e:
+            metadata['EXIF Data'] = f"Error extracting EXIF data: {e}"
 
+    metadata.update(image_metadata)
     return metadata
 
 
@@ -118,6 +187,20 @@ def get_gps_coordinates(exif_data):
     return "Not Available"
 
 
+def parse_gps_coordinates(value):
+    """Return (lat, lon) floats from a 'GPS Coordinates' value, or None if it holds no position."""
+    if isinstance(value, (tuple, list)) and len(value) == 2:
+        lat, lon = value
+    elif isinstance(value, str) and ',' in value:
+        lat, lon = value.split(',', 1)
+    else:
+        return None
+    try:
+        return float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+
+
 def convert_to_degrees(value):
     d = float(value[0].num) / float(value[0].den)
     m = float(value[1].num) / float(value[1].den)
@@ -125,7 +208,7 @@ def convert_to_degrees(value):
     return d + (m / 60.0) + (s / 3600.0)
 
 
-def extract_audio_metadata(file_path):
+def extract_audio_metadata(file_path, head=None):
     metadata = {}
 
     if not HAS_MUTAGEN:
@@ -185,7 +268,7 @@ def format_duration(seconds):
         return f"{m}:{s:02d}"
 
 
-def extract_video_metadata(file_path):
+def extract_video_metadata(file_path, head=None):
     metadata = {}
 
     # Basic video metadata - without additional libraries
@@ -195,14 +278,14 @@ def extract_video_metadata(file_path):
     # For now, we'll just identify it as a video file
     metadata['Media Type'] = "Video"
 
-    if HAS_MAGIC:
+    if file_utils.HAS_MAGIC:
         try:
-            mime = magic.Magic(mime=True)
-            mime_type = mime.from_file(file_path)
-            metadata['MIME Type'] = mime_type
+            if head is None:
+                head = file_utils.read_file_head(file_path)
 
-            magic_desc = magic.Magic()
-            desc = magic_desc.from_file(file_path)
+            metadata['MIME Type'] = file_utils.get_buffer_mime_type(head)
+
+            desc = file_utils.get_buffer_description(head)
             metadata['File Description'] = desc
 
             if 'x' in desc and 'resolution' in desc:
@@ -214,7 +297,7 @@ def extract_video_metadata(file_path):
     return metadata
 
 
-def extract_document_metadata(file_path):
+def extract_document_metadata(file_path, head=None):
     metadata = {}
     ext = file_utils.get_file_extension(file_path)
 
@@ -249,3 +332,23 @@ def extract_document_metadata(file_path):
             metadata['Text Analysis'] = f"Error analyzing text: {e}"
 
     return metadata
+
+
+registry = ExtractorRegistry()
+
+registry.register(
+    "image", extract_image_metadata, "Images", FILE_TYPES['Images'], ("image/*",),
+    cost=COST_FULL, dependencies=("exifread", "PIL")
+)
+registry.register(
+    "audio", extract_audio_metadata, "Audio", FILE_TYPES['Audio'], ("audio/*",),
+    cost=COST_FULL, dependencies=("mutagen",)
+)
+registry.register(
+    "video", extract_video_metadata, "Video", FILE_TYPES['Video'], ("video/*",),
+    cost=COST_CHEAP
+)
+registry.register(
+    "document", extract_document_metadata, "Documents", FILE_TYPES['Documents'], ("application/pdf",),
+    cost=COST_FULL, tier=TIER_FULL
+)
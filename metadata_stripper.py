@@ -0,0 +1,227 @@
+import os
+import struct
+import shutil
+
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+JPEG_SIGNATURE = b"\xff\xd8"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# JPEG markers: APP0-APP15, COM and start of scan
+_APP0, _APP15 = 0xE0, 0xEF
+_APP2 = 0xE2
+_APP14 = 0xEE
+_COM = 0xFE
+_SOS = 0xDA
+_EOI = 0xD9
+# Markers that have no length field
+_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+
+# Application segments that change how the pixels decode, so they are kept
+# even though they are APPn segments
+_JPEG_KEEP_SEGMENTS = {
+    _APP0: b"JFIF\0",  # JFIF header; JFXX thumbnails are dropped
+    _APP2: b"ICC_PROFILE\0",  # colour profile; FlashPix and MPF data are dropped
+    _APP14: b"Adobe",  # colour transform flag for CMYK / YCCK images
+}
+
+# Ancillary PNG chunks that affect how the image renders; every other
+# ancillary chunk (text, eXIf, tIME, pHYs, ...) is dropped
+PNG_KEEP_ANCILLARY = {b"tRNS", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT", b"acTL", b"fcTL", b"fdAT"}
+
+
+def _read_exact(source, size):
+    data = source.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of file")
+    return data
+
+
+def _copy(source, destination, size):
+    # Stream size bytes without holding them in memory
+    while size > 0:
+        data = source.read(min(size, COPY_BUFFER_SIZE))
+        if not data:
+            raise ValueError("Unexpected end of file")
+        destination.write(data)
+        size -= len(data)
+
+
+def _skip(source, size):
+    source.seek(size, os.SEEK_CUR)
+
+
+def strip_jpeg(source, destination):
+    """
+    Copy a JPEG from source to destination without its APPn and COM segments.
+
+    Segments are copied byte for byte up to the first start of scan, after
+    which the entropy-coded data and everything following it is copied
+    untouched, so nothing is decoded or re-encoded. Returns the number of
+    segments dropped.
+    """
+    if source.read(2) != JPEG_SIGNATURE:
+        raise ValueError("Not a JPEG file")
+    destination.write(JPEG_SIGNATURE)
+
+    dropped = 0
+    while True:
+        byte = _read_exact(source, 1)
+        if byte != b"\xff":
+            raise ValueError("Corrupt JPEG marker")
+        marker = _read_exact(source, 1)[0]
+        while marker == 0xFF:
+            # Fill bytes before a marker
+            marker = _read_exact(source, 1)[0]
+
+        if marker in _STANDALONE_MARKERS:
+            destination.write(bytes((0xFF, marker)))
+            continue
+        if marker == _EOI:
+            destination.write(bytes((0xFF, marker)))
+            return dropped
+
+        length_bytes = _read_exact(source, 2)
+        length = struct.unpack(">H", length_bytes)[0]
+        if length < 2:
+            raise ValueError("Corrupt JPEG segment length")
+
+        if _APP0 <= marker <= _APP15 or marker == _COM:
+            signature = _JPEG_KEEP_SEGMENTS.get(marker)
+            if signature is not None:
+                payload = _read_exact(source, length - 2)
+                if payload.startswith(signature):
+                    destination.write(bytes((0xFF, marker)) + length_bytes + payload)
+                    continue
+            else:
+                _skip(source, length - 2)
+            dropped += 1
+            continue
+
+        destination.write(bytes((0xFF, marker)) + length_bytes)
+        _copy(source, destination, length - 2)
+
+        if marker == _SOS:
+            shutil.copyfileobj(source, destination, COPY_BUFFER_SIZE)
+            return dropped
+
+
+def strip_png(source, destination):
+    """
+    Copy a PNG from source to destination keeping only the critical chunks
+    and the ancillary chunks in PNG_KEEP_ANCILLARY.
+
+    Kept chunks, including their CRCs, are copied byte for byte and image
+    data is streamed, so nothing is decoded. Returns the number of chunks
+    dropped.
+    """
+    if source.read(len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+        raise ValueError("Not a PNG file")
+    destination.write(PNG_SIGNATURE)
+
+    dropped = 0
+    while True:
+        header = source.read(8)
+        if not header:
+            raise ValueError("PNG file has no IEND chunk")
+        if len(header) != 8:
+            raise ValueError("Unexpected end of file")
+
+        length, chunk_type = struct.unpack(">I4s", header)
+        # Bit 5 of the first byte (lowercase) marks an ancillary chunk
+        critical = not chunk_type[0] & 0x20
+
+        if critical or chunk_type in PNG_KEEP_ANCILLARY:
+            destination.write(header)
+            _copy(source, destination, length + 4)
+        else:
+            _skip(source, length + 4)
+            dropped += 1
+
+        if chunk_type == b"IEND":
+            return dropped
+
+
+STRIPPERS = {
+    JPEG_SIGNATURE: strip_jpeg,
+    PNG_SIGNATURE: strip_png,
+}
+
+
+def get_stripper(file_path):
+    """Return the stripper for a file based on its signature, or None."""
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(len(PNG_SIGNATURE))
+    except OSError:
+        return None
+
+    for signature, stripper in STRIPPERS.items():
+        if head.startswith(signature):
+            return stripper
+    return None
+
+
+def strip_file(file_path, output_path):
+    """
+    Write a copy of file_path without metadata to output_path.
+
+    The copy is written next to output_path and moved into place once
+    complete, so output_path may be file_path itself. Returns the number of
+    segments or chunks dropped; raises ValueError for unsupported or
+    corrupt files.
+    """
+    stripper = get_stripper(file_path)
+    if stripper is None:
+        raise ValueError("Only JPEG and PNG files can be stripped without re-encoding")
+
+    temp_path = output_path + ".tmp"
+    try:
+        with open(file_path, 'rb') as source, open(temp_path, 'wb') as destination:
+            dropped = stripper(source, destination)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return dropped
+
+
+def strip_image(file_path, output_path):
+    """
+    strip_file() for JPEG and PNG; other image formats are re-encoded from
+    their pixels with PIL, which drops their metadata but decodes the image.
+    """
+    if get_stripper(file_path) is not None:
+        strip_file(file_path, output_path)
+        return
+
+    from PIL import Image
+
+    with Image.open(file_path) as img:
+        # A fresh image carries none of the source's info or tags
+        new_img = Image.new(img.mode, img.size)
+        new_img.paste(img)
+        if img.mode == 'P':
+            new_img.putpalette(img.getpalette())
+        new_img.save(output_path)
+
+
+def strip_audio(file_path, output_path):
+    """Copy an audio file to output_path and delete its tags (ID3, Vorbis comments, MP4 atoms) with mutagen."""
+    import mutagen
+
+    temp_path = output_path + ".tmp"
+    try:
+        shutil.copyfile(file_path, temp_path)
+        audio = mutagen.File(temp_path)
+        if audio is not None:
+            audio.delete()
+            audio.save()
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,115 @@
+import re
+import sys
+
+from file_view import FileView
+from file_walker import walk_files
+
+
+# Indicator tag -> bytes regex
+SUSPICIOUS_STRING_PATTERNS = {
+    "password": rb"password",
+    "passwd": rb"passwd",
+    "pass": rb"pass",
+    "auth": rb"auth",
+    "login": rb"login",
+    "url": rb"http[s]?://",
+    "email": rb"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+",
+    "private key": rb"BEGIN.*PRIVATE KEY",
+    "ssh key": rb"ssh-rsa",
+    "exec": rb"exec\(",
+    "eval": rb"eval\(",
+    "powershell": rb"powershell",
+    "cmd.exe": rb"cmd\.exe",
+    "shell": rb"shell",
+    "socket": rb"socket",
+    "connect": rb"connect\(",
+    "process": rb"process",
+    "system": rb"system\(",
+    "bin/sh": rb"bin/sh",
+    "bin/bash": rb"bin/bash",
+}
+
+PDF_JAVASCRIPT_PATTERNS = {
+    "/JavaScript": rb"/JavaScript",
+    "/JS": rb"/JS",
+    "eval(": rb"eval\(",
+    "function(": rb"function\(",
+    "document.write": rb"document\.write",
+}
+
+PDF_HIDDEN_CONTENT_PATTERNS = {
+    "Embedded Files": rb"/EmbeddedFiles",
+    "File Attachment": rb"/FileAttachment",
+    "Launch Action": rb"/Launch",
+    "URI Action": rb"/URI",
+    "Hidden Layers": rb"/OCG",
+    "AcroForm": rb"/AcroForm",
+    "XFA Forms": rb"/XFA",
+}
+
+# Target of a /URI action, matched at the offset of a "URI Action" hit
+PDF_URI_PATTERN = re.compile(rb"/URI\s*\(([^)]+)\)")
+
+
+class PatternScanner:
+    """
+    Match a set of tagged indicator patterns in a single pass.
+
+    All patterns are compiled into one alternation of named groups, so a
+    buffer is scanned once no matter how many indicators there are. Where
+    several patterns match at the same offset, the one listed first wins.
+    """
+
+    def __init__(self, patterns, flags=0):
+        self.patterns = dict(patterns)
+        self.group_tags = {}
+
+        alternatives = []
+        for index, (tag, pattern) in enumerate(self.patterns.items()):
+            group = f"p{index}"
+            self.group_tags[group] = tag
+            alternatives.append(b"(?P<%s>%s)" % (group.encode(), pattern))
+
+        self.regex = re.compile(b"|".join(alternatives), flags)
+
+    def scan(self, buffer, start=0, end=None):
+        """Yield (start offset, end offset, tag) for every hit in buffer."""
+        if end is None:
+            end = len(buffer)
+        for match in self.regex.finditer(buffer, start, end):
+            yield match.start(), match.end(), self.group_tags[match.lastgroup]
+
+    def count(self, buffer):
+        """Return {tag: number of hits} for buffer."""
+        counts = {}
+        for _, _, tag in self.scan(buffer):
+            counts[tag] = counts.get(tag, 0) + 1
+        return counts
+
+
+STRING_SCANNER = PatternScanner(SUSPICIOUS_STRING_PATTERNS)
+PDF_SCANNER = PatternScanner({**PDF_JAVASCRIPT_PATTERNS, **PDF_HIDDEN_CONTENT_PATTERNS})
+
+
+def scan_file(file_path, scanner=STRING_SCANNER):
+    """Return the hits of scanner over a memory-mapped file."""
+    with FileView(file_path) as view:
+        return list(scanner.scan(view.searchable))
+
+
+def scan_directory(roots, scanner=STRING_SCANNER, **walk_options):
+    """
+    Yield (path, {tag: count}) for every file below roots with at least one hit.
+
+    walk_options are passed to file_walker.DirectoryWalker.
+    """
+    for path, _ in walk_files(roots, **walk_options):
+        try:
+            with FileView(path) as view:
+                counts = scanner.count(view.searchable)
+        except OSError as e:
+            print(f"Error scanning {path}: {e}", file=sys.stderr)
+            continue
+
+        if counts:
+            yield path, counts
@@ -0,0 +1,241 @@
+import re
+import sys
+import zlib
+from collections import namedtuple
+
+import pattern_scanner
+from file_view import FileView
+from file_walker import walk_files
+
+
+# Decoded streams larger than this are truncated, which keeps
+# decompression bombs from exhausting memory
+MAX_INFLATED_SIZE = 16 * 1024 * 1024
+
+# Bytes of context kept around each indicator hit
+CONTEXT_BEFORE = 20
+CONTEXT_AFTER = 100
+
+OBJECT_HEADER = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+STREAM_OR_END = re.compile(rb"\bstream\r?\n|\bendobj\b")
+DIRECT_LENGTH = re.compile(rb"/Length\s+(\d+)(?!\s+\d+\s+R)")
+FLATE_FILTER = re.compile(rb"/(?:FlateDecode|Fl)\b")
+XREF_ENTRY = re.compile(rb"(\d{10})\s(\d{5})\s([nf])")
+XREF_SUBSECTION = re.compile(rb"(\d+)\s+(\d+)\s*$")
+PREV_XREF = re.compile(rb"/Prev\s+(\d+)")
+
+# An indirect object; offsets are absolute positions in the buffer and the
+# stream fields are None for objects without a stream
+PdfObject = namedtuple(
+    "PdfObject",
+    ["number", "generation", "offset", "end", "stream_start", "stream_end", "filtered"]
+)
+
+# A tagged indicator hit; location is "object" for the raw object bytes,
+# "stream" for a decoded stream (offset is then the stream start) or
+# "file" for bytes outside any object
+Indicator = namedtuple("Indicator", ["number", "tag", "location", "offset", "context", "value"])
+
+
+def iter_objects(buffer):
+    """
+    Yield a PdfObject for every "N G obj ... endobj" in buffer, in file order.
+
+    buffer can be bytes or an mmap. Stream data is skipped using a direct
+    /Length where possible, so binary stream content is never mistaken for
+    object boundaries.
+    """
+    position = 0
+    size = len(buffer)
+
+    while True:
+        header = OBJECT_HEADER.search(buffer, position)
+        if not header:
+            return
+
+        stream_start = stream_end = None
+        filtered = False
+        body_start = header.end()
+        marker = STREAM_OR_END.search(buffer, body_start)
+
+        if marker is None:
+            end = size
+        elif marker.group().startswith(b"endobj"):
+            end = marker.end()
+        else:
+            dictionary = buffer[body_start:marker.start()]
+            filtered = FLATE_FILTER.search(dictionary) is not None
+            stream_start = marker.end()
+
+            length = DIRECT_LENGTH.search(dictionary)
+            stream_end = -1
+            if length:
+                candidate = stream_start + int(length.group(1))
+                if buffer[candidate:candidate + 12].lstrip(b"\r\n").startswith(b"endstream"):
+                    stream_end = candidate
+            if stream_end == -1:
+                stream_end = buffer.find(b"endstream", stream_start)
+            if stream_end == -1:
+                stream_end = size
+
+            end = buffer.find(b"endobj", stream_end)
+            end = size if end == -1 else end + len(b"endobj")
+
+        yield PdfObject(int(header.group(1)), int(header.group(2)), header.start(), end,
+                        stream_start, stream_end, filtered)
+        position = max(end, body_start)
+
+
+def read_xref(buffer):
+    """
+    Return {object number: offset} from the classic xref tables of buffer,
+    following /Prev links through incremental updates.
+
+    Returns None when the file has no readable xref table (for example when
+    it only uses cross-reference streams).
+    """
+    start = buffer.rfind(b"startxref")
+    if start == -1:
+        return None
+
+    match = re.match(rb"startxref\s+(\d+)", buffer[start:start + 40])
+    if not match:
+        return None
+
+    offsets = {}
+    visited = set()
+    position = int(match.group(1))
+    found = False
+
+    while position not in visited and 0 <= position < len(buffer):
+        visited.add(position)
+        if buffer[position:position + 4] != b"xref":
+            break
+        found = True
+
+        trailer = buffer.find(b"trailer", position)
+        if trailer == -1:
+            break
+
+        number = 0
+        for line in bytes(buffer[position + 4:trailer]).splitlines():
+            subsection = XREF_SUBSECTION.match(line.strip())
+            if subsection:
+                number = int(subsection.group(1))
+                continue
+            entry = XREF_ENTRY.match(line.strip())
+            if entry:
+                # Newer sections take precedence over the ones they update
+                if entry.group(3) == b"n":
+                    offsets.setdefault(number, int(entry.group(1)))
+                number += 1
+
+        previous = PREV_XREF.search(buffer[trailer:trailer + 1024])
+        if not previous:
+            break
+        position = int(previous.group(1))
+
+    return offsets if found else None
+
+
+def decode_stream(buffer, obj, max_size=MAX_INFLATED_SIZE):
+    """Inflate a FlateDecode stream, or return None if it is not one or is corrupt."""
+    if obj.stream_start is None or not obj.filtered:
+        return None
+    try:
+        return zlib.decompressobj().decompress(buffer[obj.stream_start:obj.stream_end], max_size)
+    except zlib.error:
+        return None
+
+
+def _hits(source, number, location, offset=None, scanner=pattern_scanner.PDF_SCANNER, start=0, end=None):
+    for hit_start, hit_end, tag in scanner.scan(source, start, end):
+        value = None
+        if tag == "URI Action":
+            uri = pattern_scanner.PDF_URI_PATTERN.match(source, hit_start)
+            if uri:
+                value = bytes(uri.group(1))
+        context = bytes(source[max(0, hit_start - CONTEXT_BEFORE):hit_end + CONTEXT_AFTER])
+        yield Indicator(number, tag, location, hit_start if offset is None else offset, context, value)
+
+
+def iter_indicators(buffer, inflate=True, scanner=pattern_scanner.PDF_SCANNER, objects=None):
+    """
+    Yield an Indicator for every hit of scanner in buffer, object by object.
+
+    Raw object bytes and the bytes between objects are scanned in place;
+    with inflate, FlateDecode streams (including object streams) are
+    decoded one at a time and scanned as well. objects can pass in the
+    result of an earlier iter_objects() call.
+    """
+    if objects is None:
+        objects = iter_objects(buffer)
+
+    position = 0
+    for obj in objects:
+        if obj.offset > position:
+            yield from _hits(buffer, None, "file", scanner=scanner, start=position, end=obj.offset)
+
+        yield from _hits(buffer, obj.number, "object", scanner=scanner, start=obj.offset, end=obj.end)
+
+        if inflate:
+            decoded = decode_stream(buffer, obj)
+            if decoded:
+                yield from _hits(decoded, obj.number, "stream", offset=obj.stream_start, scanner=scanner)
+
+        position = max(position, obj.end)
+
+    if position < len(buffer):
+        yield from _hits(buffer, None, "file", scanner=scanner, start=position)
+
+
+def summarize_structure(buffer, objects=None):
+    """Count the objects and streams of a PDF and check them against its xref."""
+    if objects is None:
+        objects = list(iter_objects(buffer))
+
+    xref = read_xref(buffer)
+    summary = {
+        'Objects': len(objects),
+        'Streams': sum(1 for obj in objects if obj.stream_start is not None),
+        'Xref Entries': len(xref) if xref is not None else "No xref table",
+    }
+    if xref is not None:
+        summary['Objects Missing From Xref'] = len({obj.number for obj in objects} - set(xref))
+    return summary
+
+
+def triage(buffer, inflate=True):
+    """Summarize the structure and indicators of a PDF held in buffer."""
+    objects = list(iter_objects(buffer))
+
+    indicators = {}
+    for indicator in iter_indicators(buffer, inflate, objects=objects):
+        indicators[indicator.tag] = indicators.get(indicator.tag, 0) + 1
+
+    summary = summarize_structure(buffer, objects)
+    summary['Indicators'] = indicators
+    return summary
+
+
+def triage_file(file_path, inflate=True):
+    """triage() over a memory-mapped file."""
+    try:
+        with FileView(file_path) as view:
+            return triage(view.searchable, inflate)
+    except Exception as e:
+        print(f"Error scanning PDF {file_path}: {e}", file=sys.stderr)
+        return {"Error": str(e)}
+
+
+def triage_directory(roots, inflate=True, **walk_options):
+    """
+    Yield (path, summary) for every PDF below roots.
+
+    walk_options are passed to file_walker.DirectoryWalker; unless include
+    is given, only *.pdf files are scanned.
+    """
+    if not walk_options.get("include"):
+        walk_options["include"] = "*.pdf"
+    for path, _ in walk_files(roots, **walk_options):
+        yield path, triage_file(path, inflate)
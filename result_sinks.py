@@ -0,0 +1,207 @@
+import csv
+import json
+import sqlite3
+from exporters import (
+    XmlWriter, CsvWriter, HtmlReportWriter, ColumnarWriter, JsonlWriter, HTML_PAGE_SIZE, COLUMNAR_FORMATS
+)
+
+
+DEFAULT_CSV_FIELDS = [
+    'File Name',
+    'File Path',
+    'File Size',
+    'File Extension',
+    'File Type Category',
+    'MIME Type',
+    'Creation Date',
+    'Modified Date',
+    'Accessed Date',
+    'Checksum (MD5)',
+    'Checksum (SHA1)',
+    'Checksum (SHA256)',
+]
+
+
+# File formats open_file_sink() can stream batch results to
+FILE_SINK_FORMATS = ('.jsonl', '.csv', '.xml', '.html') + COLUMNAR_FORMATS
+
+
+def _as_record(path, metadata):
+    if 'File Path' in metadata:
+        return metadata
+    record = {'File Path': path}
+    record.update(metadata)
+    return record
+
+
+class ResultSink:
+    """
+    Destination for batch results that are streamed instead of collected.
+
+    BatchProcessor calls write() from a single drain thread for every
+    processed file and close() once the batch is over.
+    """
+
+    def write(self, path, metadata):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CallbackSink(ResultSink):
+
+    def __init__(self, callback, close_callback=None):
+        self.callback = callback
+        self.close_callback = close_callback
+
+    def write(self, path, metadata):
+        self.callback(path, metadata)
+
+    def close(self):
+        if self.close_callback:
+            self.close_callback()
+
+
+class JsonlSink(ResultSink):
+    """Write one JSON line per file, optionally compressed and rotated; see exporters.JsonlWriter."""
+
+    def __init__(self, file_path, compression=None, max_bytes=None):
+        self.writer = JsonlWriter(file_path, compression, max_bytes)
+
+    def write(self, path, metadata):
+        self.writer.write(_as_record(path, metadata))
+
+    def close(self):
+        self.writer.close()
+
+
+class CsvSink(ResultSink):
+    """
+    Write one CSV row per file with a fixed set of columns.
+
+    The columns have to be known before the first row is written, so any
+    field not listed in fieldnames is dropped.
+    """
+
+    def __init__(self, file_path, fieldnames=None):
+        if fieldnames is None:
+            fieldnames = DEFAULT_CSV_FIELDS
+
+        self.file = open(file_path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, path, metadata):
+        self.writer.writerow(_as_record(path, metadata))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class SpooledCsvSink(ResultSink):
+    """
+    Write every field of every file as CSV; see exporters.CsvWriter.
+
+    Unlike CsvSink no columns are dropped, but in the "wide" layout the
+    CSV itself is only written when the sink is closed.
+    """
+
+    def __init__(self, file_path, layout="wide"):
+        self.writer = CsvWriter(file_path, layout)
+
+    def write(self, path, metadata):
+        self.writer.write(_as_record(path, metadata))
+
+    def close(self):
+        self.writer.close()
+
+
+class XmlSink(ResultSink):
+    """Write one <File> element per file; see exporters.XmlWriter."""
+
+    def __init__(self, file_path):
+        self.writer = XmlWriter(file_path)
+
+    def write(self, path, metadata):
+        self.writer.write(_as_record(path, metadata))
+
+    def close(self):
+        self.writer.close()
+
+
+class HtmlReportSink(ResultSink):
+    """Write a paged HTML report; see exporters.HtmlReportWriter."""
+
+    def __init__(self, file_path, page_size=HTML_PAGE_SIZE):
+        self.writer = HtmlReportWriter(file_path, page_size)
+
+    def write(self, path, metadata):
+        self.writer.write(_as_record(path, metadata))
+
+    def close(self):
+        self.writer.close()
+
+
+class ColumnarSink(ResultSink):
+    """Write Parquet or Arrow IPC in row groups; see exporters.ColumnarWriter."""
+
+    def __init__(self, file_path, format_type='.parquet'):
+        self.writer = ColumnarWriter(file_path, format_type)
+
+    def write(self, path, metadata):
+        self.writer.write(_as_record(path, metadata))
+
+    def close(self):
+        self.writer.close()
+
+
+class SqliteSink(ResultSink):
+
+    def __init__(self, db_path, table="metadata", commit_interval=1000):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.table = table
+        self.commit_interval = commit_interval
+        self.pending = 0
+        self.conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" (path TEXT PRIMARY KEY, metadata TEXT NOT NULL)'
+        )
+
+    def write(self, path, metadata):
+        self.conn.execute(
+            f'INSERT OR REPLACE INTO "{self.table}" VALUES (?, ?)',
+            (path, json.dumps(metadata, default=str))
+        )
+        self.pending += 1
+        if self.pending >= self.commit_interval:
+            self.conn.commit()
+            self.pending = 0
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
+
+def open_file_sink(file_path, format_type, csv_layout="wide", page_size=HTML_PAGE_SIZE, compression=None,
+                   max_bytes=None):
+    """Return the sink that streams batch results to file_path as format_type (see FILE_SINK_FORMATS)."""
+    if format_type == '.csv':
+        return SpooledCsvSink(file_path, csv_layout)
+    if format_type == '.xml':
+        return XmlSink(file_path)
+    if format_type == '.html':
+        return HtmlReportSink(file_path, page_size)
+    if format_type in COLUMNAR_FORMATS:
+        return ColumnarSink(file_path, format_type)
+    if format_type == '.jsonl':
+        return JsonlSink(file_path, compression, max_bytes)
+    raise ValueError(f"Unsupported batch output format: {format_type}")
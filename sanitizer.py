@@ -0,0 +1,246 @@
+import os
+import threading
+import concurrent.futures
+
+import file_utils
+import metadata_stripper
+from extractor_registry import TIER_HEADER
+from file_walker import walk_files
+from lazy_imports import is_available
+from metadata_extractors import extract_metadata, registry
+
+
+# Categories (see constants.FILE_TYPES) that can be sanitized
+SUPPORTED_CATEGORIES = ("Images", "Audio")
+
+STATUS_SANITIZED = "sanitized"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+STATUSES = (STATUS_SANITIZED, STATUS_SKIPPED, STATUS_FAILED, STATUS_CANCELLED)
+
+# Byte patterns of an XMP packet, in a JPEG APP1 segment, a PNG iTXt chunk or raw
+XMP_MARKERS = (b"<x:xmpmeta", b"http://ns.adobe.com/xap/1.0/", b"XML:com.adobe.xmp")
+
+# Leading bytes searched for XMP during verification; metadata blocks
+# precede the image or audio data in every supported format
+VERIFY_READ_SIZE = 256 * 1024
+
+MANIFEST_FIELDS = [
+    'File Path',
+    'Output Path',
+    'Status',
+    'File Size',
+    'Output Size',
+    'Output Checksum (SHA256)',
+    'Remaining Metadata',
+    'Error',
+]
+
+
+def sanitize_file(file_path, output_path):
+    """Write a copy of file_path without metadata to output_path."""
+    category = file_utils.get_file_type_category(file_path)
+    if category == "Images":
+        metadata_stripper.strip_image(file_path, output_path)
+    elif category == "Audio":
+        metadata_stripper.strip_audio(file_path, output_path)
+    else:
+        raise ValueError(f"Metadata removal not supported for {category} files")
+
+
+def missing_verify_dependencies(file_path):
+    """Modules the extractor for file_path needs that are not installed; without them nothing can be verified."""
+    extractor = registry.lookup(file_path, file_utils.guess_mime_type(file_path))
+    if extractor is None:
+        return []
+    return [module for module in extractor.dependencies if not is_available(module)]
+
+
+def root_prefixes(roots):
+    """Mirror tree prefix per root: "" for a single root, else its basename made unique with an index."""
+    if len(roots) == 1:
+        return [""]
+
+    prefixes = []
+    for root in roots:
+        name = os.path.basename(root) or "root"
+        prefix = name
+        index = 1
+        while prefix in prefixes:
+            index += 1
+            prefix = f"{name}-{index}"
+        prefixes.append(prefix)
+    return prefixes
+
+
+def find_remaining_metadata(file_path):
+    """
+    Re-extract a sanitized file and return the kinds of metadata still in it.
+
+    An image that can no longer be opened is reported as well, since
+    stripping must never break the file.
+    """
+    remaining = []
+    metadata = extract_metadata(file_path, calc_checksums=False, tier=TIER_HEADER)
+
+    if any(key.startswith("EXIF: ") for key in metadata):
+        remaining.append("EXIF")
+    if any(key.startswith("Tag: ") for key in metadata):
+        remaining.append("Audio Tags")
+    if any(marker in file_utils.read_file_head(file_path, VERIFY_READ_SIZE) for marker in XMP_MARKERS):
+        remaining.append("XMP")
+    if metadata.get('File Type Category') == "Images" and 'Image Format' not in metadata:
+        remaining.append("Unreadable Image")
+
+    return remaining
+
+
+class BatchSanitizer:
+    """
+    Write metadata-free copies of every supported file below some roots to
+    a mirror tree under output_root.
+
+    Files are stripped on a pool of worker threads (stripping streams the
+    file, so the work is I/O bound) with a bounded number of files in
+    flight. With verify, every output is re-extracted and removed again if
+    any EXIF, audio tags or XMP remain. One manifest record per file is
+    written to sink, and callback(processed, counts) reports progress.
+
+    Outputs that are newer than their source are skipped unless overwrite
+    is set, so a tree can be sanitized again incrementally. After stop(),
+    files already handed to the pool are recorded as cancelled instead of
+    being written, so the manifest shows which files were finished.
+    """
+
+    def __init__(self, output_root, max_workers=4, verify=True, overwrite=False, sink=None, callback=None):
+        self.output_root = os.path.abspath(output_root)
+        self.max_workers = max_workers
+        self.verify = verify
+        self.overwrite = overwrite
+        self.sink = sink
+        self.callback = callback
+        self.counts = dict.fromkeys(STATUSES, 0)
+        self.processed_count = 0
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+
+    def output_path(self, file_path, root, prefix=""):
+        if os.path.isdir(root):
+            relative = os.path.relpath(file_path, root)
+        else:
+            relative = os.path.basename(file_path)
+        return os.path.join(self.output_root, prefix, relative)
+
+    def run(self, roots, **walk_options):
+        """Sanitize every file below roots; returns the number of files per status."""
+        if isinstance(roots, str):
+            roots = [roots]
+        roots = [os.path.abspath(root) for root in roots]
+
+        for root in roots:
+            if os.path.isdir(root) and os.path.commonpath([root, self.output_root]) == root:
+                raise ValueError(f"Output directory {self.output_root} is inside {root}")
+
+        slots = threading.BoundedSemaphore(self.max_workers * 4)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                # Several roots are mirrored side by side so their files cannot collide
+                for root, prefix in zip(roots, root_prefixes(roots)):
+                    if self.stopped.is_set():
+                        break
+                    for path, stat_result in walk_files(root, **walk_options):
+                        if self.stopped.is_set():
+                            break
+                        slots.acquire()
+                        future = executor.submit(
+                            self._sanitize, path, self.output_path(path, root, prefix), stat_result
+                        )
+                        future.add_done_callback(lambda f, p=path: self._done(f, p, slots))
+            except BaseException:
+                # e.g. KeyboardInterrupt; the pool is drained on exit, so cancel what it still holds
+                self.stop()
+                raise
+
+        return dict(self.counts)
+
+    def stop(self):
+        self.stopped.set()
+
+    def _sanitize(self, path, output_path, stat_result):
+        record = {
+            'File Path': path,
+            'Output Path': output_path,
+            'File Size': stat_result.st_size,
+        }
+
+        if self.stopped.is_set():
+            return self._cancelled(record)
+
+        if file_utils.get_file_type_category(path) not in SUPPORTED_CATEGORIES:
+            record['Status'] = STATUS_SKIPPED
+            record['Error'] = "Unsupported file type"
+            return record
+
+        if self.verify:
+            missing = missing_verify_dependencies(path)
+            if missing:
+                # Re-extraction would find nothing, so the output could never be verified
+                record['Status'] = STATUS_FAILED
+                record['Error'] = f"Cannot verify without {', '.join(missing)}"
+                return record
+
+        if not self.overwrite:
+            try:
+                if os.stat(output_path).st_mtime_ns >= stat_result.st_mtime_ns:
+                    record['Status'] = STATUS_SKIPPED
+                    record['Error'] = "Output is up to date"
+                    return record
+            except OSError:
+                pass
+
+        if self.stopped.is_set():
+            return self._cancelled(record)
+
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            sanitize_file(path, output_path)
+
+            if self.verify:
+                remaining = find_remaining_metadata(output_path)
+                if remaining:
+                    # Never leave an output behind that still carries metadata
+                    os.remove(output_path)
+                    record['Status'] = STATUS_FAILED
+                    record['Remaining Metadata'] = remaining
+                    record['Error'] = "Metadata remains after stripping"
+                    return record
+
+            record['Output Size'] = os.path.getsize(output_path)
+            record['Output Checksum (SHA256)'] = file_utils.calculate_checksum(output_path, 'sha256')
+            record['Status'] = STATUS_SANITIZED
+        except Exception as e:
+            record['Status'] = STATUS_FAILED
+            record['Error'] = str(e)
+
+        return record
+
+    def _cancelled(self, record):
+        record['Status'] = STATUS_CANCELLED
+        record['Error'] = "Stopped before the file was sanitized"
+        return record
+
+    def _done(self, future, path, slots):
+        slots.release()
+        try:
+            record = future.result()
+        except Exception as e:
+            record = {'File Path': path, 'Status': STATUS_FAILED, 'Error': str(e)}
+
+        with self.lock:
+            self.counts[record['Status']] += 1
+            self.processed_count += 1
+            if self.sink is not None:
+                self.sink.write(path, record)
+            if self.callback:
+                self.callback(self.processed_count, dict(self.counts))
@@ -0,0 +1,113 @@
+"""
+Check module import time against a budget using ``python -X importtime``.
+
+    python startup_benchmark.py                  # check every entry point
+    python startup_benchmark.py cli --verbose    # also list the slowest imports
+
+Each target is imported in a fresh interpreter, the best of several runs is
+compared with its budget and the imported modules are checked against the
+heavy libraries that entry point must not load at startup. The exit status
+is 1 when any check fails.
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+
+# Budgets are generous compared to a warm run so slow machines don't fail spuriously
+TARGETS = {
+    "cli": {
+        "budget_ms": 150,
+        "forbidden": ("tkinter", "matplotlib", "PIL", "numpy", "PyPDF2", "exifread", "mutagen"),
+    },
+    "metadata_extractors": {
+        "budget_ms": 120,
+        "forbidden": ("tkinter", "matplotlib", "PIL", "numpy", "PyPDF2", "exifread", "mutagen"),
+    },
+    "FileScope": {
+        "budget_ms": 300,
+        "forbidden": ("matplotlib", "PIL", "numpy", "PyPDF2", "exifread", "mutagen"),
+    },
+}
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import(module):
+    """Import module in a fresh interpreter; return (total us, {module: cumulative us})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            imports[name.strip()] = int(cumulative)
+        except ValueError:
+            # Header line
+            continue
+
+    return imports.get(module, 0), imports
+
+
+def _is_forbidden(name, forbidden):
+    return any(name == module or name.startswith(module + ".") for module in forbidden)
+
+
+def check_target(module, budget_ms, forbidden, runs=3, verbose=False):
+    best = None
+    imports = {}
+    for _ in range(runs):
+        total, imports = measure_import(module)
+        best = total if best is None else min(best, total)
+
+    total_ms = best / 1000
+    loaded = sorted(name for name in imports if _is_forbidden(name, forbidden))
+    ok = total_ms <= budget_ms and not loaded
+
+    status = "OK  " if ok else "FAIL"
+    print(f"{status} {module}: {total_ms:.1f} ms (budget {budget_ms} ms)")
+    if loaded:
+        print(f"     imports heavy modules at startup: {', '.join(loaded)}")
+
+    if verbose:
+        slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:10]
+        for name, cumulative in slowest:
+            print(f"     {cumulative / 1000:8.1f} ms  {name}")
+
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check module import time against a budget.")
+    parser.add_argument("targets", nargs="*", metavar="TARGET",
+                        help=f"modules to check (default: all of {', '.join(TARGETS)})")
+    parser.add_argument("--runs", type=int, default=3, help="imports per target; the fastest counts")
+    parser.add_argument("--budget-ms", type=float, help="override the budget of every target")
+    parser.add_argument("-v", "--verbose", action="store_true", help="list the slowest imports")
+    args = parser.parse_args(argv)
+
+    unknown = [module for module in args.targets if module not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target: {', '.join(unknown)}")
+
+    ok = True
+    for module in args.targets or TARGETS:
+        target = TARGETS[module]
+        budget_ms = args.budget_ms if args.budget_ms is not None else target["budget_ms"]
+        ok = check_target(module, budget_ms, target["forbidden"], max(1, args.runs), args.verbose) and ok
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import re
+import sys
+import heapq
+from functools import lru_cache
+
+from file_view import FileView
+from file_walker import walk_files
+
+
+DEFAULT_MIN_LENGTH = 4
+ENCODINGS = ("ascii", "utf-16le")
+
+
+@lru_cache(maxsize=None)
+def _compile(encoding, min_length):
+    if encoding == "ascii":
+        return re.compile(rb'[\x20-\x7e]{%d,}' % min_length)
+    if encoding == "utf-16le":
+        return re.compile(rb'(?:[\x20-\x7e]\x00){%d,}' % min_length)
+    raise ValueError(f"Unsupported string encoding: {encoding}")
+
+
+def _scan(buffer, encoding, min_length):
+    for match in _compile(encoding, min_length).finditer(buffer):
+        yield match.start(), encoding, match.group().decode(encoding)
+
+
+def iter_strings(buffer, min_length=DEFAULT_MIN_LENGTH, encodings=ENCODINGS):
+    """
+    Lazily yield (offset, encoding, text) for printable strings in buffer.
+
+    buffer can be bytes, a memoryview or an mmap. Results from all
+    encodings are merged in offset order, so callers can page through them
+    with itertools.islice without scanning the rest of the buffer.
+    """
+    if isinstance(encodings, str):
+        encodings = [encodings]
+    return heapq.merge(*(_scan(buffer, encoding, min_length) for encoding in encodings))
+
+
+def iter_file_strings(file_path, min_length=DEFAULT_MIN_LENGTH, encodings=ENCODINGS):
+    """iter_strings() over a memory-mapped file."""
+    with FileView(file_path) as view:
+        yield from iter_strings(view.searchable, min_length, encodings)
+
+
+def iter_directory_strings(roots, min_length=DEFAULT_MIN_LENGTH, encodings=ENCODINGS, **walk_options):
+    """
+    Yield (path, offset, encoding, text) for every file below roots.
+
+    walk_options are passed to file_walker.DirectoryWalker. Unreadable
+    files are reported and skipped.
+    """
+    for path, _ in walk_files(roots, **walk_options):
+        try:
+            for offset, encoding, text in iter_file_strings(path, min_length, encodings):
+                yield path, offset, encoding, text
+        except OSError as e:
+            print(f"Error extracting strings from {path}: {e}", file=sys.stderr)
@@ -1,11 +1,20 @@
 import os
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
 import file_utils
+import metadata_extractors
+import exporters
 from visualizers import MetadataVisualizer, ComparisonVisualizer
 from constants import LIGHT_THEME, DARK_THEME, EXPORT_FORMATS, FILE_TYPES
 
 
+# Delay after the last keystroke before the metadata list is filtered
+SEARCH_DEBOUNCE_MS = 150
+
+# Rows moved per mouse wheel step in the metadata list
+SCROLL_ROWS = 3
+
+
 class Header(tk.Frame):
 
     def __init__(self, parent, app_name, theme_callback):
@@ -112,6 +121,19 @@ class FileUploadPanel(tk.Frame):
         batch_button.grid(row=0, column=1, padx=5)
 
 
+        folder_button = tk.Button(
+            upload_frame,
+            text="Batch Folder",
+            command=self.upload_batch_folder,
+            font=("Arial", 12),
+            bg=colors["button_bg"],
+            fg=colors["button_fg"],
+            padx=10,
+            pady=5
+        )
+        folder_button.grid(row=0, column=2, padx=5)
+
+
         filter_label = tk.Label(
             upload_frame,
             text="File Type:",
@@ -119,7 +141,7 @@ class FileUploadPanel(tk.Frame):
             fg=colors["fg_color"],
             font=("Arial", 12)
         )
-        filter_label.grid(row=0, column=2, padx=(20, 5))
+        filter_label.grid(row=0, column=3, padx=(20, 5))
 
         self.file_type_var = tk.StringVar(value="All Files")
         file_types = ["All Files"] + list(FILE_TYPES.keys())
@@ -132,7 +154,7 @@ class FileUploadPanel(tk.Frame):
             width=15,
             font=("Arial", 11)
         )
-        file_type_dropdown.grid(row=0, column=3, padx=5)
+        file_type_dropdown.grid(row=0, column=4, padx=5)
 
 
         self.file_path_var = tk.StringVar(value="No file selected")
@@ -191,6 +213,13 @@ class FileUploadPanel(tk.Frame):
             self.file_path_var.set(f"Selected {len(file_paths)} files for batch processing")
             self.batch_callback(file_paths)
 
+    def upload_batch_folder(self):
+        directory = filedialog.askdirectory(title="Select Folder for Batch Processing")
+
+        if directory:
+            self.file_path_var.set(f"Selected folder {directory} for batch processing")
+            self.batch_callback([directory])
+
     def update_theme(self, theme):
         self.theme = theme
         colors = LIGHT_THEME if theme == "light" else DARK_THEME
@@ -340,6 +369,15 @@ class ImagePreviewPanel(tk.Frame):
 
 
 class MetadataDisplayPanel(tk.Frame):
+    """
+    Key/value view of a metadata dict that stays responsive with thousands
+    of fields.
+
+    The Treeview only ever holds the rows that fit on screen; scrolling
+    refills those rows from the filtered row list. Searching matches
+    against a lowercase index built once per display_metadata() call, and
+    is debounced so typing does not refilter on every keystroke.
+    """
 
     def __init__(self, parent):
         try:
@@ -376,7 +414,7 @@ class MetadataDisplayPanel(tk.Frame):
         search_label.pack(side=tk.LEFT, padx=5)
 
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", self._on_search)
+        self.search_var.trace_add("write", self._on_search)
 
         search_entry = tk.Entry(
             search_frame,
@@ -388,63 +426,163 @@ class MetadataDisplayPanel(tk.Frame):
         )
         search_entry.pack(side=tk.LEFT)
 
-        self.metadata_display = scrolledtext.ScrolledText(
-            self,
-            wrap=tk.WORD,
-            font=("Arial", 10),
-            bg=colors["text_area_bg"],
-            fg=colors["text_area_fg"],
-            insertbackground=colors["fg_color"]
+        list_frame = tk.Frame(self, bg=colors["bg_color"])
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        self.style = ttk.Style(self)
+        self._configure_style(colors)
+
+        self.metadata_tree = ttk.Treeview(
+            list_frame,
+            columns=("field", "value"),
+            show="headings",
+            style="Metadata.Treeview",
+            selectmode="extended"
         )
-        self.metadata_display.pack(fill=tk.BOTH, expand=True, pady=5)
-        self.metadata_display.config(state="disabled")
+        self.metadata_tree.heading("field", text="Field", anchor="w")
+        self.metadata_tree.heading("value", text="Value", anchor="w")
+        self.metadata_tree.column("field", width=220, stretch=False)
+        self.metadata_tree.column("value", width=400, stretch=True)
+
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.metadata_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.metadata_tree.bind("<Configure>", self._on_resize)
+        self.metadata_tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.metadata_tree.bind("<Button-4>", lambda event: self._scroll_by(-SCROLL_ROWS))
+        self.metadata_tree.bind("<Button-5>", lambda event: self._scroll_by(SCROLL_ROWS))
+        self.metadata_tree.bind("<Prior>", lambda event: self._scroll_by(-self.page_size))
+        self.metadata_tree.bind("<Next>", lambda event: self._scroll_by(self.page_size))
+        self.metadata_tree.bind("<Control-c>", self._copy_selection)
 
         self.original_metadata = {}
+        self.rows = []
+        self.search_index = []
+        self.visible_rows = []
+        self.last_query = ""
+        self.top = 0
+        self.page_size = 1
+        self.search_job = None
+
+    def _configure_style(self, colors):
+        self.style.configure(
+            "Metadata.Treeview",
+            background=colors["text_area_bg"],
+            fieldbackground=colors["text_area_bg"],
+            foreground=colors["text_area_fg"],
+            font=("Arial", 10)
+        )
+        self.style.map("Metadata.Treeview", background=[("selected", colors["accent_color"])])
 
     def display_metadata(self, metadata):
         self.original_metadata = metadata
-        self._update_display(metadata)
-
-    def _update_display(self, metadata):
-        self.metadata_display.config(state="normal")
-        self.metadata_display.delete(1.0, tk.END)
+        self.rows = []
 
         if isinstance(metadata, dict):
             for key, value in sorted(metadata.items()):
-                if key == 'GPS Coordinates' and value and isinstance(value, str) and ',' in value:
-                    lat, lon = value.split(',')
-                    lat, lon = lat.strip(), lon.strip()
-                    self.metadata_display.insert(tk.END, f"{key}: https://www.google.com/maps?q={lat},{lon}\n")
-                else:
-                    self.metadata_display.insert(tk.END, f"{key}: {value}\n")
+                position = metadata_extractors.parse_gps_coordinates(value) if key == 'GPS Coordinates' else None
+                if position:
+                    lat, lon = position
+                    value = f"https://www.google.com/maps?q={lat},{lon}"
+                self.rows.append((str(key), str(value)))
         else:
-            self.metadata_display.insert(tk.END, "No metadata available.")
-
-        self.metadata_display.config(state="disabled")
+            self.rows.append(("No metadata available.", ""))
+
+        # Built once, so each search is plain substring tests on prepared strings
+        self.search_index = [f"{key}\0{value}".lower() for key, value in self.rows]
+        self.last_query = None
+        self._apply_filter()
+
+    def _apply_filter(self):
+        self.search_job = None
+        query = self.search_var.get().lower()
+
+        if not query:
+            self.visible_rows = range(len(self.rows))
+        elif self.last_query and query.startswith(self.last_query):
+            # A longer query can only narrow the previous matches
+            self.visible_rows = [i for i in self.visible_rows if query in self.search_index[i]]
+        else:
+            self.visible_rows = [i for i, text in enumerate(self.search_index) if query in text]
+
+        self.last_query = query
+        self.top = 0
+        self._render()
+
+    def _render(self):
+        tree = self.metadata_tree
+        total = len(self.visible_rows)
+        self.top = max(0, min(self.top, total - self.page_size))
+        page = [self.rows[i] for i in self.visible_rows[self.top:self.top + self.page_size]]
+
+        # Reuse the existing items so scrolling only updates their values
+        items = tree.get_children()
+        for item, row in zip(items, page):
+            tree.item(item, values=row)
+        if len(items) > len(page):
+            tree.delete(*items[len(page):])
+        for row in page[len(items):]:
+            tree.insert("", tk.END, values=row)
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.page_size) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self.top + rows)
+        return "break"
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self.visible_rows) - self.page_size))
+        if top != self.top:
+            self.top = top
+            self.metadata_tree.selection_remove(self.metadata_tree.selection())
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.visible_rows)))
+        elif action == "scroll":
+            step = self.page_size if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-SCROLL_ROWS if event.delta > 0 else SCROLL_ROWS)
+
+    def _on_resize(self, event):
+        row_height = int(self.style.lookup("Metadata.Treeview", "rowheight") or 20)
+        # One row of the height goes to the column headings
+        page_size = max(1, event.height // row_height - 1)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self._render()
 
     def _on_search(self, *args):
-        if not self.original_metadata:
-            return
-
-        search_query = self.search_var.get().lower()
-
-        if not search_query:
-            self._update_display(self.original_metadata)
-            return
-
-        filtered_metadata = {}
-        for key, value in self.original_metadata.items():
-            if (search_query in key.lower() or
-                    (isinstance(value, str) and search_query in value.lower())):
-                filtered_metadata[key] = value
-
-        self._update_display(filtered_metadata)
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self._apply_filter)
+
+    def _copy_selection(self, event=None):
+        tree = self.metadata_tree
+        lines = [": ".join(tree.item(item, "values")) for item in tree.selection()]
+        if lines:
+            self.clipboard_clear()
+            self.clipboard_append("\n".join(lines))
+        return "break"
 
     def clear(self):
-        self.metadata_display.config(state="normal")
-        self.metadata_display.delete(1.0, tk.END)
-        self.metadata_display.config(state="disabled")
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+            self.search_job = None
         self.original_metadata = {}
+        self.rows = []
+        self.search_index = []
+        self.visible_rows = []
+        self.last_query = ""
+        self.top = 0
+        self._render()
 
     def update_theme(self, theme):
         self.theme = theme
@@ -461,11 +599,7 @@ class MetadataDisplayPanel(tk.Frame):
                     elif isinstance(subchild, tk.Entry):
                         subchild.configure(bg=colors["text_area_bg"], fg=colors["text_area_fg"])
 
-        self.metadata_display.configure(
-            bg=colors["text_area_bg"],
-            fg=colors["text_area_fg"],
-            insertbackground=colors["fg_color"]
-        )
+        self._configure_style(colors)
 
 
 class ActionButtonsPanel(tk.Frame):
@@ -1139,7 +1273,10 @@ class ExportDialog(tk.Toplevel):
 
         self.format_var = tk.StringVar(value=".json")
 
-        for name, ext in EXPORT_FORMATS.items():
+        # Parquet and Arrow need pyarrow; don't offer them without it
+        self.formats = {name: ext for name, ext in EXPORT_FORMATS.items() if exporters.export_format_available(ext)}
+
+        for name, ext in self.formats.items():
             format_radio = tk.Radiobutton(
                 options_frame,
                 text=name,
@@ -1225,7 +1362,7 @@ class ExportDialog(tk.Toplevel):
             title="Save Metadata",
             initialfile=suggested_name,
             defaultextension=format_type,
-            filetypes=[(f"{ext.upper()[1:]} File", f"*{ext}") for ext in EXPORT_FORMATS.values()]
+            filetypes=[(f"{ext.upper()[1:]} File", f"*{ext}") for ext in self.formats.values()]
         )
 
         if file_path: